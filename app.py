@@ -1,12 +1,20 @@
 import streamlit as st
-import io
-import re
 import os
 import pandas as pd
-import numpy as np
 import tempfile
+import time
+import hashlib
+import shutil
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from pdf_processor import PDFTableExtractor
+from pdf_processor import STRATEGIES, PDFTableExtractor, extract_pdf_tables, save_tables_to_excel
+from table_cache import TableCache
+from layout_cache import LayoutCache
+from template_index import TemplateIndex
+from column_types import memory_report
+from extraction_jobs import ExtractionJobManager
 
 # Add this at the top of your app.py file, replacing the current CSS
 
@@ -383,356 +391,298 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def is_date(text):
-    """Check if text is a date in common formats."""
-    date_patterns = [
-        r'\d{1,2}[-/]\d{1,2}[-/]\d{2,4}',  # dd/mm/yyyy or dd-mm-yyyy
-        r'\d{1,2}[-/][A-Za-z]{3}[-/]\d{2,4}',  # dd/mmm/yyyy
-        r'\d{1,2}[-/][A-Za-z]{3,9}[-/]\d{2,4}',  # dd/month/yyyy
-    ]
-    
-    return any(re.match(pattern, text) for pattern in date_patterns)
+# Tables listed per page of the preview index
+PREVIEW_PAGE_SIZE = 10
+# Most recent tables previewed while an extraction is still running
+LIVE_PREVIEW_TABLES = 5
+# Seconds between reruns while following an extraction job
+JOB_POLL_SECONDS = 0.3
 
-def extract_bank_statement_tables(text_content):
+@st.cache_resource
+def get_table_cache():
     """
-    Extract tables from bank statement format PDFs.
-    This function is specialized for the format in the first PDF.
+    Process-wide cache of extracted tables, shared across sessions and reruns.
+    
+    Set PDF_TABLE_CACHE_DIR to also persist results on disk, within PDF_TABLE_CACHE_DISK_MB.
     """
-    # Split by pages or sections
-    sections = re.split(r'Page No: \d+|Statement of account', text_content)
-    
-    transactions = []
-    current_date = None
-    
-    # Regular expression to match transaction lines with date, description, and amount
-    transaction_pattern = r'(\d{2}[-/]\w{3}[-/]\d{4}|\d{2}[-/]\d{2}[-/]\d{4})\s+(.*?)\s+([\d,.]+\.\d{2})\s+(.*?Dr|.*?Cr)'
-    simple_transaction_pattern = r'(\d{2}[-/]\w{3}[-/]\d{4}|\d{2}[-/]\d{2}[-/]\d{4})\s+([A-Z].*?)\s+([\d,.]+\.\d{2})'
-    
-    for section in sections:
-        lines = section.strip().split('\n')
-        for line in lines:
-            # Skip empty lines and headers
-            if not line.strip() or "BANK NAME" in line or "BRANCH NAME" in line:
-                continue
-                
-            # Try to extract transaction using patterns
-            match = re.search(transaction_pattern, line)
-            if not match:
-                match = re.search(simple_transaction_pattern, line)
-                
-            if match:
-                date_str = match.group(1)
-                description = match.group(2).strip()
-                amount = match.group(3).strip().replace(',', '')
-                
-                # Try to determine if it's debit or credit
-                is_debit = "Dr" in line or "TO " in description
-                
-                transactions.append({
-                    "Date": date_str,
-                    "Description": description,
-                    "Amount": float(amount),
-                    "Type": "Debit" if is_debit else "Credit"
-                })
-    
-    # If transactions were found, convert to DataFrame
-    if transactions:
-        df = pd.DataFrame(transactions)
-        return {"Bank Statement": df}
-    
-    # Fallback to general table extraction
-    return extract_general_tables(text_content)
+    max_mb = int(os.environ.get("PDF_TABLE_CACHE_MB", "256"))
+    max_disk_mb = int(os.environ.get("PDF_TABLE_CACHE_DISK_MB", "1024"))
+    return TableCache(max_bytes=max_mb * 1024 * 1024, cache_dir=os.environ.get("PDF_TABLE_CACHE_DIR"),
+                      max_disk_bytes=max_disk_mb * 1024 * 1024)
 
-def extract_code_based_tables(text_content):
+@st.cache_resource
+def get_layout_cache():
     """
-    Extract tables with code-based structure like those in the test6.pdf
-    where each line might start with a code or reference.
+    Process-wide on-disk cache of pdfminer layouts, or None unless PDF_LAYOUT_CACHE_DIR is set.
+    
+    Lets re-extraction after a detection change skip layout analysis.
     """
-    # Split text into lines
-    lines = text_content.split('\n')
-    
-    # Remove empty lines
-    lines = [line.strip() for line in lines if line.strip()]
-    
-    # Look for patterns like "$2 $ $2 $ )0*-*" or similar
-    pattern = r'\$\d+\s+\$\s+\$\d+\s+\$\s+[A-Za-z0-9\*\-]+\s+'
-    
-    # Group lines by potential tables
-    current_table = []
-    all_tables = []
-    in_table = False
-    
-    for line in lines:
-        # Check if this line could be a new table row
-        if re.match(pattern, line):
-            if not in_table:
-                in_table = True
-                current_table = [line]
-            else:
-                current_table.append(line)
-        elif in_table and line and not line.startswith("---"):
-            # Continue adding to current table if we're not seeing a separator
-            current_table.append(line)
-        else:
-            # End of table
-            if in_table and current_table:
-                all_tables.append(current_table)
-                current_table = []
-                in_table = False
-    
-    # Don't forget the last table
-    if in_table and current_table:
-        all_tables.append(current_table)
-    
-    # Process tables
-    processed_tables = {}
-    for i, table_lines in enumerate(all_tables):
-        if len(table_lines) < 3:  # Skip too small tables
-            continue
-        
-        # Create dataframe from the table
-        try:
-            # Extract columns by splitting on consistent whitespace
-            table_data = []
-            for line in table_lines:
-                # Split by multiple spaces
-                cols = re.split(r'\s{2,}', line)
-                table_data.append(cols)
-            
-            # Find the max columns
-            max_cols = max(len(row) for row in table_data)
-            
-            # Normalize data
-            normalized_data = [row + [''] * (max_cols - len(row)) for row in table_data]
-            
-            # Create dataframe
-            df = pd.DataFrame(normalized_data)
-            
-            # Use first row as header if it seems appropriate
-            if all(isinstance(cell, str) and not cell.isdigit() for cell in normalized_data[0]):
-                df.columns = df.iloc[0]
-                df = df.iloc[1:]
-            
-            # Add to processed tables
-            processed_tables[f"Code_Table_{i+1}"] = df
-        except Exception as e:
-            st.error(f"Error processing table {i+1}: {str(e)}")
+    cache_dir = os.environ.get("PDF_LAYOUT_CACHE_DIR")
+    return LayoutCache(cache_dir) if cache_dir else None
+
+@st.cache_resource
+def get_template_index():
+    """
+    Process-wide index of recurring document templates and their learned table columns.
     
-    return processed_tables
+    Set PDF_TEMPLATE_INDEX_FILE to keep what it learned across restarts.
+    """
+    return TemplateIndex(os.environ.get("PDF_TEMPLATE_INDEX_FILE"))
 
-def extract_vertical_tables(text_content):
+@st.cache_resource
+def get_job_manager():
     """
-    Extract tables where content is organized vertically with key-value pairs.
-    Common in bank statements and other financial documents.
+    Process-wide background executor for extraction jobs, shared across sessions.
     """
-    # Split text into lines
-    lines = text_content.split('\n')
-    
-    # Remove empty lines
-    lines = [line.strip() for line in lines if line.strip()]
+    return ExtractionJobManager(max_workers=int(os.environ.get("PDF_EXTRACTION_WORKERS", "2")))
+
+@st.cache_resource
+def get_batch_pool():
+    """
+    Process-wide worker pool for multi-file uploads, shared across sessions.
     
-    # Look for patterns like "Key : Value" or "Key: Value"
-    info_data = []
+    pdfminer is pure Python, so files are spread over processes rather than threads
+    to use every core. PDF_BATCH_WORKERS overrides the default of one per CPU.
+    """
+    max_workers = int(os.environ.get("PDF_BATCH_WORKERS", str(os.cpu_count() or 1)))
+    # Spawned workers don't inherit the Streamlit server's threads
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+def poll_job(job):
+    """
+    Render an extraction job's progress and latest tables, rerunning the script until it finishes.
     
-    for line in lines:
-        # Try to extract key-value pairs
-        match = re.search(r'([A-Za-z0-9\s\./]+)\s*[:]\s*(.+)', line)
-        if match:
-            key = match.group(1).strip()
-            value = match.group(2).strip()
-            info_data.append({"Field": key, "Value": value})
+    Each run draws the current state once and schedules a rerun, so the script
+    thread is never held for the whole extraction and widgets stay responsive.
     
-    if info_data:
-        df = pd.DataFrame(info_data)
-        return {"Account_Information": df}
+    Args:
+        job: The ExtractionJob to follow.
     
-    return {}
-
-def extract_general_tables(text_content):
-    """
-    Extract tables from general PDF content by identifying tabular structures.
-    This is a more generic approach for PDFs with various table formats.
+    Returns:
+        dict: The final tables, None if the job handed them to the table cache, or
+            an empty dict if the job failed. While the job is running this does not
+            return; the script is rerun instead.
     """
-    tables = {}
-    table_count = 0
-    
-    # Split text into lines
-    lines = text_content.split('\n')
-    
-    # Remove empty lines
-    lines = [line.strip() for line in lines if line.strip()]
-    
-    # Variables to track table detection
-    in_table = False
-    current_table = []
-    column_widths = []
-    current_table_name = None
-    
-    for i, line in enumerate(lines):
-        # Check if this line might be a header
-        if (re.search(r'^\s*[A-Za-z\s]+\s*$', line) and 
-            i + 1 < len(lines) and 
-            re.search(r'\d', lines[i + 1])):
-            # This could be a table header followed by data
-            if in_table:
-                # Save previous table
-                if current_table:
-                    table_df = pd.DataFrame(current_table)
-                    table_name = current_table_name or f"Table_{table_count}"
-                    tables[table_name] = table_df
-                    table_count += 1
-                    current_table = []
-            
-            in_table = True
-            current_table_name = line.strip()
-            continue
-        
-        # If we detect a line with multiple numeric values or specific patterns
-        # indicating tabular data
-        if in_table or re.search(r'(\d+\s+){2,}', line) or re.search(r'(\$[\d,.]+\s+){2,}', line):
-            if not in_table:
-                in_table = True
-            
-            # Try to split the line into columns
-            # First by whitespace
-            columns = line.split()
-            
-            # Check if we can identify a better delimiter
-            if len(columns) <= 2 and ("|" in line or "," in line or "\t" in line):
-                if "|" in line:
-                    columns = [col.strip() for col in line.split("|") if col.strip()]
-                elif "," in line:
-                    columns = [col.strip() for col in line.split(",")]
-                elif "\t" in line:
-                    columns = [col.strip() for col in line.split("\t")]
-            
-            # Add to current table
-            if columns:
-                current_table.append(columns)
-        else:
-            # Check if we're ending a table
-            if in_table and not re.search(r'(\d+\s+){2,}', line):
-                if current_table:
-                    try:
-                        # Try to create a DataFrame
-                        # Normalize columns to handle different lengths
-                        max_cols = max(len(row) for row in current_table)
-                        normalized_table = [row + [''] * (max_cols - len(row)) for row in current_table]
-                        
-                        # Use first row as header if it seems like a header
-                        if all(isinstance(cell, str) and not cell.isdigit() for cell in normalized_table[0]):
-                            headers = normalized_table[0]
-                            data = normalized_table[1:]
-                            table_df = pd.DataFrame(data, columns=headers)
-                        else:
-                            table_df = pd.DataFrame(normalized_table)
-                        
-                        table_name = current_table_name or f"Table_{table_count}"
-                        tables[table_name] = table_df
-                        table_count += 1
-                    except Exception as e:
-                        st.error(f"Error creating table: {e}")
-                
-                in_table = False
-                current_table = []
-                current_table_name = None
-    
-    # Don't forget the last table
-    if in_table and current_table:
-        try:
-            max_cols = max(len(row) for row in current_table)
-            normalized_table = [row + [''] * (max_cols - len(row)) for row in current_table]
-            
-            if all(isinstance(cell, str) and not cell.isdigit() for cell in normalized_table[0]):
-                headers = normalized_table[0]
-                data = normalized_table[1:]
-                table_df = pd.DataFrame(data, columns=headers)
-            else:
-                table_df = pd.DataFrame(normalized_table)
-            
-            table_name = current_table_name or f"Table_{table_count}"
-            tables[table_name] = table_df
-        except Exception as e:
-            st.error(f"Error creating last table: {e}")
+    state = job.snapshot()
     
-    # If no tables found with the structured approach, try a simpler line-based approach
-    if not tables:
-        tables = extract_line_based_tables(text_content)
+    if state["status"] == "failed":
+        st.error(f"Error extracting tables: {state['error']}")
+        return {}
+    if state["status"] == "done":
+        return state["tables"]
     
-    return tables
+    if state["page_count"]:
+        st.progress(
+            state["pages_done"] / state["page_count"],
+            text=f"Analyzed page {state['pages_done']} of {state['page_count']}",
+        )
+    else:
+        st.progress(0.0, text="Starting extraction...")
+    
+    # Only the most recent tables, so documents with hundreds of tables stay responsive
+    if state["partial_tables"]:
+        st.caption(f"{len(state['partial_tables'])} tables found so far")
+        for table_name, df in list(state["partial_tables"].items())[-LIVE_PREVIEW_TABLES:]:
+            with st.expander(f"📋 {table_name}"):
+                st.dataframe(df.head(10), use_container_width=True)
+    
+    time.sleep(JOB_POLL_SECONDS)
+    st.rerun()
 
-def extract_line_based_tables(text_content):
+def extract_tables_from_pdf(file, strategy="auto", stitch_tables=True, infer_types=True):
     """
-    Fallback method to extract tables based on line patterns.
-    """
-    tables = {}
-    table_count = 0
+    Extract tables from a PDF file using our enhanced PDF processor.
     
-    # Split by potential table boundaries
-    sections = re.split(r'-{5,}|={5,}|\*{5,}', text_content)
+    Results are cached by content hash, so reruns and repeat uploads of the
+    same file skip extraction entirely. Otherwise extraction runs as a
+    background job whose tables are shown page by page as they are found.
     
-    for section in sections:
-        lines = section.strip().split('\n')
-        if len(lines) <= 3:  # Too small to be a table
-            continue
+    Args:
+        file: A file-like object containing the PDF.
+        strategy: "auto" or the name of a registered extraction strategy.
+        stitch_tables: Join tables that continue onto the next page into one table.
+        infer_types: Convert amount, date and repeated text columns to typed columns.
+    
+    Returns:
+        tuple: The result's cache key (None on error) and a dictionary with table
+            names as keys and pandas DataFrames as values.
+    """
+    try:
+        # Files on disk, such as the samples, are memory-mapped; the job gets its own copy
+        with PDFTableExtractor(file_object=file, strategy=strategy, template_index=get_template_index(),
+                               stitch_tables=stitch_tables, infer_types=infer_types) as processor:
+            pdf_bytes = bytes(processor.get_pdf_data())
+            settings = processor.get_settings()
         
-        # Check if this section has consistent patterns that might indicate a table
-        data_lines = []
+        cache = get_table_cache()
+        cache_key = cache.make_key(pdf_bytes, settings)
+        tables = cache.get(cache_key)
+        if tables is not None:
+            return cache_key, tables
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Check if line has numeric content
-            if re.search(r'\d', line):
-                # Split on consistent delimiters or whitespace patterns
-                if '|' in line:
-                    columns = [col.strip() for col in line.split('|') if col.strip()]
-                elif re.search(r'\s{2,}', line):
-                    columns = re.split(r'\s{2,}', line)
-                else:
-                    columns = line.split()
-                
-                data_lines.append(columns)
+        # Reattach to a job this session already started, e.g. after a rerun mid-extraction
+        jobs = get_job_manager()
+        session_key = f"extraction_job_{cache_key}"
+        job = jobs.get(st.session_state.get(session_key, ""))
+        if job is None:
+            job_id = jobs.submit(pdf_bytes, on_complete=lambda tables: cache.put(cache_key, tables),
+                                 layout_cache=get_layout_cache(), strategy=strategy,
+                                 template_index=get_template_index(), stitch_tables=stitch_tables,
+                                 infer_types=infer_types)
+            st.session_state[session_key] = job_id
+            job = jobs.get(job_id)
         
-        if data_lines and len(data_lines) >= 3:  # Need at least a few rows to consider it a table
-            # Normalize column count
-            max_cols = max(len(row) for row in data_lines)
-            normalized_data = [row + [''] * (max_cols - len(row)) for row in data_lines]
-            
-            # Create DataFrame
-            table_df = pd.DataFrame(normalized_data)
-            tables[f"Table_{table_count}"] = table_df
-            table_count += 1
-    
-    return tables
+        tables = poll_job(job)
+        if job.status == "failed":
+            # Forget the failed job, so the next run, such as clicking Extract again, retries
+            st.session_state.pop(session_key, None)
+            return None, {}
+        if tables is None:
+            # The job handed its tables to the cache; if they were evicted since, extract again
+            tables = cache.get(cache_key)
+            if tables is None:
+                st.session_state.pop(session_key, None)
+                st.rerun()
+        return cache_key, tables
+    except Exception as e:
+        st.error(f"Error extracting tables: {str(e)}")
+        return None, {}
 
-def extract_tables_from_pdf(file):
+def extract_tables_from_pdfs(files, strategy="auto", stitch_tables=True, infer_types=True):
     """
-    Extract tables from a PDF file using our enhanced PDF processor.
+    Extract tables from several PDF files concurrently.
+    
+    Cached files return immediately; the rest are fanned out to the batch worker
+    pool and reported as each one finishes. The batch's results and failures are
+    kept in the session, so reruns never extract its files again.
     
     Args:
-        file: A file-like object containing the PDF.
+        files: File-like objects with a name attribute, such as Streamlit uploads.
+        strategy: "auto" or the name of a registered extraction strategy.
+        stitch_tables: Join tables that continue onto the next page into one table.
+        infer_types: Convert amount, date and repeated text columns to typed columns.
     
     Returns:
-        dict: Dictionary with table names as keys and pandas DataFrames as values.
+        tuple: A key identifying this set of results, and a dictionary of file names
+            mapped to their tables in upload order. Uploads sharing a name are
+            numbered, as in "statement (2).pdf". Files that failed are left out.
     """
-    try:
-        # Create a PDF processor instance with the file object
-        processor = PDFTableExtractor(file_object=file)
+    cache = get_table_cache()
+    pool = get_batch_pool()
+    template_index = get_template_index()
+    file_names = unique_file_names([file.name for file in files])
+    
+    uploads = []
+    for file, file_name in zip(files, file_names):
+        with PDFTableExtractor(file_object=file, strategy=strategy, template_index=template_index,
+                               stitch_tables=stitch_tables, infer_types=infer_types) as processor:
+            pdf_bytes = bytes(processor.get_pdf_data())
+            settings = processor.get_settings()
+        uploads.append((file_name, pdf_bytes, cache.make_key(pdf_bytes, settings)))
+    
+    batch_key = hashlib.sha256("".join(file_name + cache_key for file_name, _, cache_key in uploads)
+                               .encode("utf-8")).hexdigest()
+    
+    # Reruns of the same batch, e.g. preparing the download or paging through previews,
+    # reuse its results and failures instead of resubmitting files the cache no longer holds
+    session_key = f"batch_results_{batch_key}"
+    if session_key in st.session_state:
+        results, failures = st.session_state[session_key]
+        for file_name, error in failures.items():
+            st.error(f"{file_name}: {error}")
+        return batch_key, results
+    
+    results = {}
+    failures = {}
+    pending = {}
+    for file_name, pdf_bytes, cache_key in uploads:
+        tables = cache.get(cache_key)
+        if tables is not None:
+            results[file_name] = tables
+        else:
+            future = pool.submit(extract_pdf_tables, pdf_bytes, layout_cache=get_layout_cache(),
+                                 strategy=strategy, template_index=template_index,
+                                 stitch_tables=stitch_tables, infer_types=infer_types)
+            pending[future] = (file_name, cache_key)
+    
+    if pending:
+        progress_bar = st.progress(0.0, text=f"Extracting tables from {len(pending)} files...")
+        finished = st.container()
         
-        # Extract layout elements and text
-        processor.extract_layout_elements()
-        processor.extract_text()
+        for done, future in enumerate(as_completed(pending), start=1):
+            file_name, cache_key = pending[future]
+            try:
+                tables, learned_templates = future.result()
+                # Workers learn on a copy of the template index
+                template_index.merge(learned_templates)
+                cache.put(cache_key, tables)
+                results[file_name] = tables
+                finished.write(f"✅ {file_name}: {len(tables)} tables")
+            except Exception as e:
+                failures[file_name] = str(e)
+                finished.error(f"{file_name}: {str(e)}")
+            progress_bar.progress(done / len(pending), text=f"Processed {done} of {len(pending)} files")
         
-        # Extract tables with the enhanced processing
-        tables = processor.extract_tables()
+        progress_bar.empty()
+    
+    results = {file_name: results[file_name] for file_name in file_names if file_name in results}
+    # Only the latest batch is kept, as with prepared downloads
+    for key in [key for key in st.session_state if str(key).startswith("batch_results_")]:
+        del st.session_state[key]
+    st.session_state[session_key] = (results, failures)
+    return batch_key, results
+
+def unique_file_names(file_names):
+    """
+    Number repeated file names, case-insensitively, so each upload keeps its own results.
+    
+    Args:
+        file_names: File names in upload order.
+    
+    Returns:
+        list: The names, with later repeats renamed to "name (2).pdf", "name (3).pdf", ...
+    """
+    unique_names = []
+    used = set()
+    for file_name in file_names:
+        stem, extension = os.path.splitext(file_name)
+        unique_name = file_name
+        count = 2
+        while unique_name.lower() in used:
+            unique_name = f"{stem} ({count}){extension}"
+            count += 1
+        used.add(unique_name.lower())
+        unique_names.append(unique_name)
+    return unique_names
+
+def save_to_zip(results):
+    """
+    Save the tables of several files as one Excel workbook per file inside a zip archive.
+    
+    Args:
+        results: Dictionary with file names as keys and table dictionaries as values.
+    
+    Returns:
+        bytes: Zip archive as bytes.
+    """
+    # Names differing only in their extension's case would map to the same workbook
+    workbook_names = unique_file_names([os.path.splitext(file_name)[0] + ".xlsx" for file_name in results])
+    
+    with tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024) as buffer:
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for (file_name, tables), workbook_name in zip(results.items(), workbook_names):
+                if not tables:
+                    continue
+                
+                # Each workbook is streamed to its own spool file, then copied into the archive
+                with tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024) as workbook:
+                    save_tables_to_excel(tables, workbook)
+                    workbook.seek(0)
+                    with archive.open(workbook_name, "w") as entry:
+                        shutil.copyfileobj(workbook, entry)
         
-        return tables
-    except Exception as e:
-        st.error(f"Error extracting tables: {str(e)}")
-        return {}
+        buffer.seek(0)
+        return buffer.read()
 
 def save_to_excel(tables):
     """
@@ -744,25 +694,118 @@ def save_to_excel(tables):
     Returns:
         bytes: Excel file as bytes.
     """
-    buffer = io.BytesIO()
+    # Workbooks are streamed in constant-memory mode; large ones spill to a temp file on disk
+    with tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024) as buffer:
+        save_tables_to_excel(tables, buffer)
+        
+        buffer.seek(0)
+        return buffer.read()
+
+def render_table_previews(tables, key):
+    """
+    Show a paginated index of the tables and a preview of the one selected.
     
-    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-        for sheet_name, df in tables.items():
-            # Clean the sheet name (Excel has a 31 character limit and doesn't allow certain characters)
-            valid_sheet_name = re.sub(r'[\\/*?:[\]]', '', sheet_name)
-            valid_sheet_name = valid_sheet_name[:31]
-            
-            df.to_excel(writer, sheet_name=valid_sheet_name, index=False)
-            
-            # Auto-adjust column widths
-            worksheet = writer.sheets[valid_sheet_name]
-            for i, col in enumerate(df.columns):
-                # Set column width based on max length in column
-                max_len = max(df[col].astype(str).map(len).max(), len(str(col))) + 2
-                worksheet.set_column(i, i, max_len)
-    
-    buffer.seek(0)
-    return buffer.getvalue()
+    Only the current index page and the selected table are rendered, so a rerun
+    costs the same however many tables were extracted.
+    
+    Args:
+        tables: Dictionary with table names as keys and pandas DataFrames as values.
+        key: Unique key for this set of tables, used for the widget keys.
+    """
+    table_names = list(tables)
+    page_count = -(-len(table_names) // PREVIEW_PAGE_SIZE)
+    
+    page = 1
+    if page_count > 1:
+        page = st.number_input(f"Page (1-{page_count})", min_value=1, max_value=page_count, value=1,
+                               key=f"preview_page_{key}")
+    page_names = table_names[(page - 1) * PREVIEW_PAGE_SIZE:page * PREVIEW_PAGE_SIZE]
+    
+    # Table index for this page; only the shapes are read
+    st.dataframe(pd.DataFrame({
+        "Table": page_names,
+        "Rows": [tables[name].shape[0] for name in page_names],
+        "Columns": [tables[name].shape[1] for name in page_names],
+    }), hide_index=True, use_container_width=True)
+    
+    selected = st.selectbox("📋 Preview table", page_names, key=f"preview_table_{page}_{key}")
+    st.dataframe(tables[selected].head(10), use_container_width=True)
+
+def render_download(label, key, build, file_name, mime):
+    """
+    Show a download button whose file is only built once the user asks for it.
+    
+    The bytes are kept in the session for the current result, so later reruns
+    reuse them instead of serializing every table again.
+    
+    Args:
+        label: What is being downloaded, e.g. "Excel File".
+        key: Unique key for the result being downloaded.
+        build: Callable returning the file contents as bytes.
+        file_name: Name offered to the browser.
+        mime: MIME type of the file.
+    """
+    download = st.session_state.get("download")
+    if download is None or download[0] != key:
+        if not st.button(f"Prepare {label}", key=f"prepare_{key}", use_container_width=True):
+            return
+        with st.spinner(f"Preparing {label}..."):
+            download = (key, build())
+        # Only the latest result is kept, to bound session memory
+        st.session_state["download"] = download
+    
+    st.download_button(
+        label=f"📥 Download {label}",
+        data=download[1],
+        file_name=file_name,
+        mime=mime,
+        use_container_width=True,
+    )
+
+def render_results(key, tables, summary, file_prefix):
+    """
+    Show the extraction summary, an on-demand Excel download and lazy table previews.
+    
+    Args:
+        key: Cache key of the result.
+        tables: Dictionary with table names as keys and pandas DataFrames as values.
+        summary: Message shown under the heading.
+        file_prefix: Start of the downloaded file name.
+    """
+    st.markdown(f'<div class="results-container">', unsafe_allow_html=True)
+    st.markdown(f"<h2>🎉 Successfully Extracted {len(tables)} Tables</h2>", unsafe_allow_html=True)
+    
+    # Add a summary of the extraction
+    st.markdown(f"""
+    <div class="instructions">
+    <p><strong>Extraction complete!</strong> {summary}</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # The workbook is only written when asked for
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        render_download(
+            "Excel File", key, lambda: save_to_excel(tables),
+            f"{file_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+    
+    # Typed tables remember how much memory they took as strings
+    report = memory_report(tables)
+    if report["columns"]:
+        kinds = report["columns"]
+        numeric = kinds.get("integer", 0) + kinds.get("number", 0) + kinds.get("currency", 0)
+        st.caption(
+            f"Memory: {report['text_bytes'] / 1024:.0f} KB as text, {report['typed_bytes'] / 1024:.0f} KB typed "
+            f"({numeric} numeric, {kinds.get('date', 0)} date and {kinds.get('category', 0)} categorical columns)"
+        )
+    
+    # Display preview of tables
+    st.subheader("Table Previews")
+    render_table_previews(tables, key)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
 
 # Main app
 def main():
@@ -773,14 +816,29 @@ def main():
     st.sidebar.title("Navigation")
     app_mode = st.sidebar.radio("Choose an option:", ["Upload Your PDF", "Use Sample PDFs"])
     
+    # Extraction methods come from the processor's strategy registry
+    strategy = st.sidebar.selectbox(
+        "Extraction method", ["auto"] + list(STRATEGIES),
+        format_func=lambda name: "Automatic" if name == "auto" else STRATEGIES[name].description,
+    )
+    stitch_tables = st.sidebar.checkbox("Join tables continuing across pages", value=True)
+    infer_types = st.sidebar.checkbox("Typed columns (numbers, dates, categories)", value=True)
+    
+    # Result cache counters
+    cache_stats = get_table_cache().stats()
+    st.sidebar.caption(
+        f"Cache: {cache_stats['hits'] + cache_stats['disk_hits']} hits, {cache_stats['misses']} misses, "
+        f"{cache_stats['evictions']} evictions, {cache_stats['bytes'] / (1024 * 1024):.1f} MB"
+    )
+    
     if app_mode == "Upload Your PDF":
         st.markdown('<div class="file-uploader">', unsafe_allow_html=True)
-        st.subheader("📄 Upload Your PDF File")
+        st.subheader("📄 Upload Your PDF Files")
         
         # Instructions
         st.markdown("""
         <div class="instructions">
-        <p><strong>How it works:</strong> Upload a PDF file containing tables. Our intelligent algorithm will detect and extract all tables automatically.</p>
+        <p><strong>How it works:</strong> Upload one or more PDF files containing tables. Our intelligent algorithm will detect and extract all tables automatically.</p>
         <p><strong>Supported formats:</strong></p>
         <ul>
             <li>Standard tables with borders</li>
@@ -792,63 +850,70 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
-        uploaded_file = st.file_uploader("Drop your PDF here or click to browse", type="pdf")
+        uploaded_files = st.file_uploader("Drop your PDFs here or click to browse", type="pdf",
+                                          accept_multiple_files=True)
         st.markdown('</div>', unsafe_allow_html=True)
         
+        # A single file keeps the page-by-page progress view below
+        uploaded_file = uploaded_files[0] if len(uploaded_files) == 1 else None
+        
+        if len(uploaded_files) > 1:
+            batch_key, results = extract_tables_from_pdfs(uploaded_files, strategy, stitch_tables, infer_types)
+            total_tables = sum(len(tables) for tables in results.values())
+            
+            if total_tables > 0:
+                st.markdown(f'<div class="results-container">', unsafe_allow_html=True)
+                st.markdown(f"<h2>🎉 Successfully Extracted {total_tables} Tables from {len(results)} Files</h2>", unsafe_allow_html=True)
+                
+                # One download for every file: a zip with one workbook per PDF, built on demand
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col2:
+                    render_download(
+                        "All (ZIP of Excel Files)", batch_key, lambda: save_to_zip(results),
+                        f"extracted_tables_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                        "application/zip",
+                    )
+                
+                # Display preview of tables, one file at a time
+                st.subheader("Table Previews")
+                files_with_tables = [file_name for file_name, tables in results.items() if tables]
+                selected_file = st.selectbox(
+                    "📄 File", files_with_tables, key=f"preview_file_{batch_key}",
+                    format_func=lambda file_name: f"{file_name} ({len(results[file_name])} tables)",
+                )
+                render_table_previews(results[selected_file], f"{batch_key}_{files_with_tables.index(selected_file)}")
+                
+                st.markdown('</div>', unsafe_allow_html=True)
+            else:
+                st.markdown('<div class="results-container">', unsafe_allow_html=True)
+                st.error("No tables found in the uploaded PDFs. Please try different files or check if your PDFs contain tabular data.")
+                st.markdown('</div>', unsafe_allow_html=True)
+        
         if uploaded_file is not None:
             with st.spinner("Extracting tables..."):
                 # Extract tables
-                tables = extract_tables_from_pdf(uploaded_file)
+                result_key, tables = extract_tables_from_pdf(uploaded_file, strategy, stitch_tables, infer_types)
                 
-                # Count total tables
-                total_tables = len(tables)
-                
-                if total_tables > 0:
-                    st.markdown(f'<div class="results-container">', unsafe_allow_html=True)
-                    st.markdown(f"<h2>🎉 Successfully Extracted {total_tables} Tables</h2>", unsafe_allow_html=True)
-                    
-                    # Add a summary of the extraction
-                    st.markdown("""
-                    <div class="instructions">
-                    <p><strong>Extraction complete!</strong> The tables have been successfully identified and processed. You can preview them below or download the complete Excel file.</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Convert to Excel
-                    excel_data = save_to_excel(tables)
-                    
-                    # Add download button with better styling
-                    col1, col2, col3 = st.columns([1, 2, 1])
-                    with col2:
-                        st.download_button(
-                            label="📥 Download Excel File",
-                            data=excel_data,
-                            file_name=f"extracted_tables_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                            use_container_width=True,
-                        )
-                    
-                    # Display preview of tables
-                    st.subheader("Table Previews")
-                    for table_name, df in tables.items():
-                        with st.expander(f"📋 {table_name}"):
-                            st.dataframe(df.head(10), use_container_width=True)
-                    
-                    st.markdown('</div>', unsafe_allow_html=True)
-                else:
-                    st.markdown('<div class="results-container">', unsafe_allow_html=True)
-                    st.error("No tables found in the uploaded PDF. Please try a different file or check if your PDF contains tabular data.")
-                    st.markdown("""
-                    <div class="instructions">
-                    <p><strong>Troubleshooting tips:</strong></p>
-                    <ul>
-                        <li>Ensure your PDF contains structured data in a tabular format</li>
-                        <li>Check if the PDF has text content (not scanned images)</li>
-                        <li>Try our sample PDFs to test the extractor functionality</li>
-                    </ul>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    st.markdown('</div>', unsafe_allow_html=True)
+            if tables:
+                render_results(
+                    result_key, tables,
+                    "The tables have been successfully identified and processed. You can preview them below or download the complete Excel file.",
+                    "extracted_tables",
+                )
+            elif result_key is not None:
+                st.markdown('<div class="results-container">', unsafe_allow_html=True)
+                st.error("No tables found in the uploaded PDF. Please try a different file or check if your PDF contains tabular data.")
+                st.markdown("""
+                <div class="instructions">
+                <p><strong>Troubleshooting tips:</strong></p>
+                <ul>
+                    <li>Ensure your PDF contains structured data in a tabular format</li>
+                    <li>Check if the PDF has text content (not scanned images)</li>
+                    <li>Try our sample PDFs to test the extractor functionality</li>
+                </ul>
+                </div>
+                """, unsafe_allow_html=True)
+                st.markdown('</div>', unsafe_allow_html=True)
     
     else:  # Use Sample PDFs
         st.markdown('<div class="file-uploader">', unsafe_allow_html=True)
@@ -886,51 +951,27 @@ def main():
         
         st.markdown('</div>', unsafe_allow_html=True)
         
+        # Remember the extracted sample so its results survive reruns, such as
+        # preparing the download or paging through previews
         if extract_button:
+            st.session_state["extracted_sample"] = selected_file
+        
+        if st.session_state.get("extracted_sample") == selected_file:
             with st.spinner(f"Extracting tables from {selected_file}..."):
                 # Process the selected sample file
                 file_path = os.path.join("samples", selected_file)
                 
                 try:
                     with open(file_path, "rb") as file:
-                        tables = extract_tables_from_pdf(file)
-                    
-                    # Count total tables
-                    total_tables = len(tables)
+                        result_key, tables = extract_tables_from_pdf(file, strategy, stitch_tables, infer_types)
                     
-                    if total_tables > 0:
-                        st.markdown(f'<div class="results-container">', unsafe_allow_html=True)
-                        st.markdown(f"<h2>🎉 Successfully Extracted {total_tables} Tables</h2>", unsafe_allow_html=True)
-                        
-                        # Add a summary of the extraction
-                        st.markdown("""
-                        <div class="instructions">
-                        <p><strong>Extraction complete!</strong> The tables have been successfully identified and processed from the sample file. You can preview them below or download as Excel.</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        # Convert to Excel
-                        excel_data = save_to_excel(tables)
-                        
-                        # Add download button
-                        col1, col2, col3 = st.columns([1, 2, 1])
-                        with col2:
-                            st.download_button(
-                                label="📥 Download Excel File",
-                                data=excel_data,
-                                file_name=f"sample_{selected_file.split('.')[0]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                use_container_width=True,
-                            )
-                        
-                        # Display preview of tables
-                        st.subheader("Table Previews")
-                        for table_name, df in tables.items():
-                            with st.expander(f"📋 {table_name}"):
-                                st.dataframe(df.head(10), use_container_width=True)
-                        
-                        st.markdown('</div>', unsafe_allow_html=True)
-                    else:
+                    if tables:
+                        render_results(
+                            result_key, tables,
+                            "The tables have been successfully identified and processed from the sample file. You can preview them below or download as Excel.",
+                            f"sample_{selected_file.split('.')[0]}",
+                        )
+                    elif result_key is not None:
                         st.markdown('<div class="results-container">', unsafe_allow_html=True)
                         st.error("No tables found in the sample PDF.")
                         st.markdown('</div>', unsafe_allow_html=True)
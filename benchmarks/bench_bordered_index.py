@@ -0,0 +1,69 @@
+"""
+Microbenchmark: text box containment for bordered-table detection
+
+Compares the brute-force rectangle x text box scan with TextBoxGridIndex on a
+synthetic ruled page with 5,000 candidate rectangles and 10,000 text boxes.
+
+Run from the repository root:
+    python benchmarks/bench_bordered_index.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_processor import PageLayout, TextBoxGridIndex
+
+
+def make_page(num_rects=5000, num_boxes=10000, page_size=3000, seed=0):
+    rng = random.Random(seed)
+    boxes = []
+    for _ in range(num_boxes):
+        x0 = rng.uniform(0, page_size - 80)
+        y0 = rng.uniform(0, page_size - 12)
+        boxes.append((x0, y0, x0 + rng.uniform(10, 80), y0 + rng.uniform(6, 12)))
+    rects = []
+    for _ in range(num_rects):
+        x0 = rng.uniform(0, page_size - 400)
+        y0 = rng.uniform(0, page_size - 300)
+        rects.append((x0, y0, x0 + rng.uniform(110, 400), y0 + rng.uniform(60, 300)))
+    return PageLayout.bbox_array(boxes), PageLayout.bbox_array(rects)
+
+
+def brute_force(boxes, rects):
+    boxes = boxes.tolist()
+    results = []
+    for rect_x0, rect_y0, rect_x1, rect_y1 in rects.tolist():
+        results.append([index for index, (x0, y0, x1, y1) in enumerate(boxes)
+                        if x0 >= rect_x0 and x1 <= rect_x1 and
+                        y0 >= rect_y0 and y1 <= rect_y1])
+    return results
+
+
+def indexed(boxes, rects):
+    index = TextBoxGridIndex(boxes)
+    return [index.contained_in(rect).tolist() for rect in rects.tolist()]
+
+
+def main():
+    boxes, rects = make_page()
+
+    start = time.perf_counter()
+    expected = brute_force(boxes, rects)
+    brute_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = indexed(boxes, rects)
+    index_time = time.perf_counter() - start
+
+    assert actual == expected, "Indexed containment differs from brute force"
+
+    print(f"rects={len(rects)} boxes={len(boxes)} matches={sum(map(len, expected))}")
+    print(f"brute force: {brute_time:.3f}s")
+    print(f"grid index:  {index_time:.3f}s ({brute_time / index_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
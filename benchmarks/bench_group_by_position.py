@@ -0,0 +1,101 @@
+"""
+Benchmark: row clustering in group_by_position, per-element loop vs np.diff
+
+Runs the original group_by_position (sort layout objects, then a Python loop
+reading getattr(element, f"{axis}0") per element) against the current
+vectorized implementation on synthetic pages of up to 50,000 text fragments,
+and checks that both produce the same groups.
+
+Run from the repository root:
+    python benchmarks/bench_group_by_position.py
+"""
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_processor import PageLayout, PDFTableExtractor
+
+
+class Box:
+    """Minimal stand-in for a pdfminer text box"""
+    def __init__(self, index, x0, y0, x1, y1):
+        self.index = index
+        self.x0, self.y0, self.x1, self.y1 = x0, y0, x1, y1
+
+
+def legacy_group_by_position(elements, axis, threshold=10):
+    if not elements:
+        return []
+    if axis == 'x':
+        sorted_elements = sorted(elements, key=lambda e: e.x0)
+    else:
+        sorted_elements = sorted(elements, key=lambda e: -e.y0)
+
+    groups = []
+    current_group = [sorted_elements[0]]
+    current_pos = getattr(sorted_elements[0], f"{axis}0")
+    for element in sorted_elements[1:]:
+        element_pos = getattr(element, f"{axis}0")
+        if abs(element_pos - current_pos) <= threshold:
+            current_group.append(element)
+        else:
+            groups.append(current_group)
+            current_group = [element]
+            current_pos = element_pos
+    if current_group:
+        groups.append(current_group)
+    return groups
+
+
+def make_page(num_fragments, seed=0):
+    """
+    Fragments on jittered text rows 12pt apart, like a dense statement page
+    """
+    rng = random.Random(seed)
+    num_rows = max(1, num_fragments // 8)
+    bboxes = []
+    for _ in range(num_fragments):
+        y0 = rng.randrange(num_rows) * 12 + rng.uniform(-2, 2)
+        x0 = rng.uniform(0, 2000)
+        bboxes.append((x0, y0, x0 + rng.uniform(10, 80), y0 + 9))
+    boxes = PageLayout.bbox_array(bboxes)
+    # Same float32 coordinates for both implementations
+    objects = [Box(index, *bbox) for index, bbox in enumerate(boxes.tolist())]
+    return boxes, objects
+
+
+def best_of(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+def main():
+    extractor = PDFTableExtractor()
+
+    for num_fragments in [1000, 10000, 50000]:
+        boxes, objects = make_page(num_fragments)
+        indexes = np.arange(len(boxes))
+
+        for axis in ['y', 'x']:
+            expected, legacy_time = best_of(lambda: legacy_group_by_position(objects, axis))
+            actual, current_time = best_of(lambda: extractor.group_by_position(boxes, indexes, axis))
+
+            assert ([[box.index for box in group] for group in expected] ==
+                    [group.tolist() for group in actual]), "Groups differ from the legacy implementation"
+
+            print(f"fragments={num_fragments:6d} axis={axis} groups={len(actual):6d}  "
+                  f"legacy {legacy_time * 1000:8.2f} ms  current {current_time * 1000:8.2f} ms  "
+                  f"({legacy_time / current_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark: throughput and accuracy of the pdfminer layout profiles
+
+Runs extract_tables() with each entry of LAYOUT_PROFILES on samples/test3.pdf,
+samples/test6.pdf and synthetic documents made by repeating the sample pages,
+and reports pages per second, peak traced memory and how many table cells agree
+with the "balanced" profile (pdfminer's defaults, the previous behaviour).
+Every profile gets an untimed warm-up run, then the profiles are timed in turn
+REPEATS times and each one's best run is reported, so the profile measured first
+doesn't pay for imports and caches and drift hits every profile alike.
+
+Run from the repository root:
+    python benchmarks/bench_layout_profiles.py
+"""
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+from PyPDF2 import PdfReader, PdfWriter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_processor import LAYOUT_PROFILES, PDFTableExtractor
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples")
+REPEATS = 5
+
+
+def repeat_pages(path, copies):
+    """
+    Build an in-memory PDF containing every page of path, copies times over
+    """
+    reader = PdfReader(path)
+    writer = PdfWriter()
+    for _ in range(copies):
+        for page in reader.pages:
+            writer.add_page(page)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def time_extraction(pdf_bytes, profile):
+    # Timed without tracing, which slows pdfminer down considerably
+    start = time.perf_counter()
+    PDFTableExtractor(pdf_data=pdf_bytes, layout_profile=profile).extract_tables()
+    return time.perf_counter() - start
+
+
+def run(pdf_bytes, profiles, repeats=REPEATS):
+    """
+    Warm up and time every profile on one document
+    
+    Returns:
+        Dictionary of profile name to (tables, best time, peak traced memory, pages)
+    """
+    results = {}
+    for profile in profiles:
+        processor = PDFTableExtractor(pdf_data=pdf_bytes, layout_profile=profile)
+        tables = processor.extract_tables()
+        tracemalloc.start()
+        try:
+            PDFTableExtractor(pdf_data=pdf_bytes, layout_profile=profile).extract_tables()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        results[profile] = [tables, float("inf"), peak, processor.get_page_count()]
+    
+    for _ in range(repeats):
+        for profile in profiles:
+            results[profile][1] = min(results[profile][1], time_extraction(pdf_bytes, profile))
+    return {profile: tuple(result) for profile, result in results.items()}
+
+
+def cell_agreement(reference, tables):
+    """
+    Fraction of the reference tables' cells reproduced at the same position
+    """
+    total = 0
+    matched = 0
+    for name, expected in reference.items():
+        total += expected.size
+        actual = tables.get(name)
+        if actual is None or actual.shape != expected.shape or list(actual.columns) != list(expected.columns):
+            continue
+        matched += int((actual.astype(str).values == expected.astype(str).values).sum())
+    return matched / total if total else 1.0
+
+
+def main():
+    documents = [
+        ("test3.pdf", open(os.path.join(SAMPLES_DIR, "test3.pdf"), "rb").read()),
+        ("test6.pdf", open(os.path.join(SAMPLES_DIR, "test6.pdf"), "rb").read()),
+        ("test3.pdf x10", repeat_pages(os.path.join(SAMPLES_DIR, "test3.pdf"), 10)),
+        ("test6.pdf x10", repeat_pages(os.path.join(SAMPLES_DIR, "test6.pdf"), 10)),
+    ]
+
+    # balanced first, as the reference for the others
+    profiles = sorted(LAYOUT_PROFILES, key=lambda name: name != "balanced")
+    for label, pdf_bytes in documents:
+        results = run(pdf_bytes, profiles)
+        reference = results["balanced"][0]
+        for profile in profiles:
+            tables, elapsed, peak, pages = results[profile]
+            print(f"{label:14s} {profile:9s} {pages / elapsed:7.1f} pages/s  {elapsed:7.2f}s  "
+                  f"peak {peak / 2**20:7.1f} MB  tables={len(tables):4d}  "
+                  f"cells agree {cell_agreement(reference, tables):6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: fixed strategy order vs StrategyPlanner on bank statements
+
+Extracts samples/test3.pdf (a text-only bank statement) and a 10x copy of it
+with text_source="pypdf2", the only text source a planner is used with. The
+default order runs the full layout pass before falling back to the text
+strategies; a StrategyPlanner runs first cold and then after it has learned the
+template. Checks that every run returns the same tables.
+
+Run from the repository root:
+    python benchmarks/bench_strategy_planner.py
+"""
+import io
+import os
+import sys
+import time
+
+from PyPDF2 import PdfReader, PdfWriter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_processor import PDFTableExtractor
+from strategy_planner import StrategyPlanner
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples")
+
+
+def repeat_pages(path, copies):
+    """
+    Build an in-memory PDF containing every page of path, copies times over
+    """
+    reader = PdfReader(path)
+    writer = PdfWriter()
+    for _ in range(copies):
+        for page in reader.pages:
+            writer.add_page(page)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def run(pdf_bytes, text_source, planner=None):
+    start = time.perf_counter()
+    tables = PDFTableExtractor(pdf_data=pdf_bytes, text_source=text_source, planner=planner).extract_tables()
+    return tables, time.perf_counter() - start
+
+
+def same_tables(expected, actual):
+    return list(expected) == list(actual) and all(expected[name].equals(actual[name]) for name in expected)
+
+
+def main():
+    documents = [
+        ("test3.pdf", open(os.path.join(SAMPLES_DIR, "test3.pdf"), "rb").read()),
+        ("test3.pdf x10", repeat_pages(os.path.join(SAMPLES_DIR, "test3.pdf"), 10)),
+    ]
+
+    for label, pdf_bytes in documents:
+        planner = StrategyPlanner()
+        expected, fixed_time = run(pdf_bytes, "pypdf2")
+        cold, cold_time = run(pdf_bytes, "pypdf2", planner)
+        learned, learned_time = run(pdf_bytes, "pypdf2", planner)
+
+        assert same_tables(expected, cold) and same_tables(expected, learned), "Planned tables differ"
+
+        print(f"{label:14s} fixed order {fixed_time:6.2f}s  planned (cold) {cold_time:6.2f}s  "
+              f"planned (learned) {learned_time:6.2f}s  ({fixed_time / learned_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
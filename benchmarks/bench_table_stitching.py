@@ -0,0 +1,91 @@
+"""
+Benchmark: per-page DataFrames plus pd.concat vs TableStitcher
+
+Builds a synthetic 500-page bank statement whose transaction table continues
+across every page, repeating its column header at the top of each page. Joins
+the pages' tables by making one DataFrame per page and concatenating them, as
+a caller would without stitching, and by feeding page fragments to a
+TableStitcher, which appends rows into a single columnar buffer. Reports time
+and peak traced memory, and checks both give the same single table.
+
+Run from the repository root:
+    python benchmarks/bench_table_stitching.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_processor import PageLayout, PDFTableExtractor
+from table_stitcher import TableStitcher
+
+COLUMNS = [(40, "Date"), (110, "Description"), (330, "Reference"), (420, "Debit"), (490, "Credit"),
+           (560, "Balance")]
+
+
+def make_statement(num_pages=500, rows_per_page=45):
+    layouts = []
+    for page_num in range(num_pages):
+        bboxes = []
+        texts = []
+        for row in range(rows_per_page + 1):
+            y0 = 780 - row * 15
+            for x0, column in COLUMNS:
+                bboxes.append((x0, y0, x0 + 50, y0 + 9))
+                texts.append((column if row == 0 else f"{column.lower()}-{page_num}-{row}") + "\n")
+        layouts.append(PageLayout(page_num, PageLayout.bbox_array(bboxes), texts,
+                                  PageLayout.bbox_array([]), PageLayout.bbox_array([])))
+    return layouts
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def concat_pages(fragments):
+    # One DataFrame per page, header rows after the first page dropped, then one concat
+    frames = [fragment.to_frame().iloc[0 if page_num == 0 else 1:] for page_num, fragment in enumerate(fragments)]
+    return {fragments[0].name: pd.concat(frames, ignore_index=True)}
+
+
+def stitch_pages(fragments):
+    stitcher = TableStitcher()
+    tables = {}
+    for fragment in fragments:
+        tables.update(stitcher.add_page(fragment.page_num, [fragment]))
+    tables.update(stitcher.finish())
+    return tables
+
+
+def main():
+    layouts = make_statement()
+    extractor = PDFTableExtractor()
+    fragments = [fragment for layout in layouts for fragment in extractor.page_table_fragments(layout)]
+    assert len(fragments) == len(layouts), "Expected one table per page"
+
+    concatenated, concat_time, concat_peak = measure(lambda: concat_pages(fragments))
+    stitched, stitch_time, stitch_peak = measure(lambda: stitch_pages(fragments))
+
+    assert len(stitched) == 1, f"Expected one stitched table, got {len(stitched)}"
+    assert list(stitched) == list(concatenated) and all(
+        stitched[name].equals(concatenated[name]) for name in stitched), "Stitched table differs"
+
+    table = next(iter(stitched.values()))
+    print(f"pages={len(layouts)} rows={len(table)} columns={table.shape[1]}")
+    print(f"per-page DataFrames + concat: {concat_time:.3f}s  peak {concat_peak / (1024 * 1024):.1f} MB")
+    print(f"TableStitcher:                {stitch_time:.3f}s  peak {stitch_peak / (1024 * 1024):.1f} MB  "
+          f"({concat_time / stitch_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
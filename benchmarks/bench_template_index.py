@@ -0,0 +1,87 @@
+"""
+Benchmark: borderless detection heuristics vs slicing by a learned template
+
+Builds a synthetic 500-page bank statement (a header block, then 45 transaction
+rows of 6 columns per page, some with an empty debit or credit cell) and times
+detect_page_tables over every page without a TemplateIndex and with one that has
+learned the statement's columns from a first run. Layout analysis is excluded:
+both runs start from the same PageLayout objects.
+
+Run from the repository root:
+    python benchmarks/bench_template_index.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_processor import PageLayout, PDFTableExtractor
+from template_index import TemplateIndex
+
+COLUMNS = [(40, "date"), (110, "description"), (330, "reference"), (420, "debit"), (490, "credit"), (560, "balance")]
+
+
+def make_statement(num_pages=500, rows_per_page=45, seed=0):
+    rng = random.Random(seed)
+    layouts = []
+    for page_num in range(num_pages):
+        bboxes = []
+        texts = []
+        for line, text in enumerate(["BANK NAME : EXAMPLE BANK", "ACCOUNT NAME : CUSTOMER",
+                                     f"Statement of account, page {page_num + 1}"]):
+            bboxes.append((40, 800 - line * 14, 300, 809 - line * 14))
+            texts.append(text + "\n")
+        for row in range(rows_per_page):
+            y0 = 740 - row * 15
+            for x0, column in COLUMNS:
+                # Each transaction is either a debit or a credit
+                if column == ("credit" if row % 3 else "debit"):
+                    continue
+                width = 200 if column == "description" else rng.uniform(30, 60)
+                bboxes.append((x0, y0, x0 + width, y0 + 9))
+                texts.append(f"{column}-{page_num}-{row}\n")
+        layouts.append(PageLayout(page_num, PageLayout.bbox_array(bboxes), texts,
+                                  PageLayout.bbox_array([]), PageLayout.bbox_array([])))
+    return layouts
+
+
+def detect_all(layouts, template_index=None):
+    # Fresh row index caches, so both runs pay for sorting the rows
+    for layout in layouts:
+        layout.row_indexes = {}
+    extractor = PDFTableExtractor(template_index=template_index)
+    start = time.perf_counter()
+    tables = {}
+    for layout in layouts:
+        tables.update(extractor.detect_page_tables(layout))
+    elapsed = time.perf_counter() - start
+    extractor.learn_template()
+    return tables, elapsed
+
+
+def main():
+    layouts = make_statement()
+
+    heuristic_tables, heuristic_time = detect_all(layouts)
+
+    index = TemplateIndex()
+    detect_all(layouts[:1], index)
+    template_tables, template_time = detect_all(layouts, index)
+    assert index.stats()["hits"] == 1, "The statement did not match its learned template"
+
+    rows = sum(len(df) for df in template_tables.values())
+    cells = sum(int((df.values != "").sum()) for df in template_tables.values())
+    aligned = sum(int(all((df[column].str.startswith(name) | (df[column] == "")).all()
+                          for column, (_, name) in zip(df.columns, COLUMNS)))
+                  for df in template_tables.values() if df.shape[1] == len(COLUMNS))
+
+    print(f"pages={len(layouts)} boxes={sum(len(layout.texts) for layout in layouts)}")
+    print(f"heuristics: {heuristic_time:.3f}s  {len(heuristic_tables)} tables")
+    print(f"template:   {template_time:.3f}s  {len(template_tables)} tables, {rows} rows, {cells} cells, "
+          f"{aligned} tables with every cell in its own column ({heuristic_time / template_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
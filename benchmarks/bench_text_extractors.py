@@ -0,0 +1,144 @@
+"""
+Benchmark: text-based extractors before and after the compiled pattern registry
+
+Runs the previous extract_general_tables / extract_vertical_tables logic (literal
+pattern strings passed to re inside the per-line loops) against the current
+PDFTableExtractor methods on a synthetic 50,000-line statement, and checks that
+both produce identical tables. The current extractors share one classify_lines
+pass, so the combined run pays for line tagging only once.
+
+Run from the repository root:
+    python benchmarks/bench_text_extractors.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_processor import PDFTableExtractor
+
+
+def legacy_extract_general_tables(pdf_text):
+    tables = {}
+    table_count = 0
+    lines = [line.strip() for line in pdf_text.split('\n') if line.strip()]
+    in_table = False
+    current_table = []
+    current_table_name = None
+
+    def build(rows):
+        max_cols = max(len(row) for row in rows)
+        normalized = [row + [''] * (max_cols - len(row)) for row in rows]
+        if all(isinstance(cell, str) and not cell.isdigit() for cell in normalized[0]):
+            return pd.DataFrame(normalized[1:], columns=normalized[0])
+        return pd.DataFrame(normalized)
+
+    for i, line in enumerate(lines):
+        if (re.search(r'^\s*[A-Za-z\s]+\s*$', line) and
+            i + 1 < len(lines) and
+            re.search(r'\d', lines[i + 1])):
+            if in_table and current_table:
+                tables[current_table_name or f"Table_{table_count}"] = pd.DataFrame(current_table)
+                table_count += 1
+                current_table = []
+            in_table = True
+            current_table_name = line.strip()
+            continue
+
+        if in_table or re.search(r'(\d+\s+){2,}', line) or re.search(r'(\$[\d,.]+\s+){2,}', line):
+            in_table = True
+            columns = line.split()
+            if len(columns) <= 2 and ("|" in line or "," in line or "\t" in line):
+                if "|" in line:
+                    columns = [col.strip() for col in line.split("|") if col.strip()]
+                elif "," in line:
+                    columns = [col.strip() for col in line.split(",")]
+                elif "\t" in line:
+                    columns = [col.strip() for col in line.split("\t")]
+            if columns:
+                current_table.append(columns)
+        elif in_table and not re.search(r'(\d+\s+){2,}', line):
+            if current_table:
+                tables[current_table_name or f"Table_{table_count}"] = build(current_table)
+                table_count += 1
+            in_table = False
+            current_table = []
+            current_table_name = None
+
+    if in_table and current_table:
+        tables[current_table_name or f"Table_{table_count}"] = build(current_table)
+    return tables
+
+
+def legacy_extract_vertical_tables(pdf_text):
+    lines = [line.strip() for line in pdf_text.split('\n') if line.strip()]
+    info_data = []
+    for line in lines:
+        match = re.search(r'([A-Za-z0-9\s\./]+)\s*[:]\s*(.+)', line)
+        if match:
+            info_data.append({"Field": match.group(1).strip(), "Value": match.group(2).strip()})
+    return {"Account_Information": pd.DataFrame(info_data)} if info_data else {}
+
+
+def make_statement(num_lines=50000, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    while len(lines) < num_lines:
+        kind = rng.random()
+        if kind < 0.02:
+            lines.append("Transaction Details")
+        elif kind < 0.06:
+            lines.append(f"Account No : {rng.randint(10**9, 10**10)}")
+        elif kind < 0.10:
+            lines.append("Balance brought forward from previous page")
+        else:
+            lines.append(f"{rng.randint(1, 28):02d}-01-2024  UPI/{rng.randint(1000, 9999)}/PAYMENT  "
+                         f"{rng.randint(1, 99999)}  {rng.randint(100, 999999)}")
+    return "\n".join(lines)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def same_tables(a, b):
+    return list(a) == list(b) and all(a[name].equals(b[name]) for name in a)
+
+
+def new_extractor(text):
+    extractor = PDFTableExtractor()
+    extractor.pdf_text = text
+    return extractor
+
+
+def main():
+    text = make_statement()
+
+    # Each extractor on its own, starting from a cold line classification
+    for label, legacy, current in [
+        ("general", legacy_extract_general_tables, PDFTableExtractor.extract_general_tables),
+        ("vertical", legacy_extract_vertical_tables, PDFTableExtractor.extract_vertical_tables),
+    ]:
+        expected, legacy_time = timed(legacy, text)
+        actual, current_time = timed(current, new_extractor(text))
+        assert same_tables(expected, actual), f"{label} tables differ from the legacy implementation"
+        print(f"{label:9s} legacy {legacy_time:.3f}s  current {current_time:.3f}s  "
+              f"({legacy_time / current_time:.1f}x)  tables={len(actual)}")
+
+    # Both extractors on one document, sharing the classified lines
+    _, legacy_time = timed(lambda: (legacy_extract_general_tables(text), legacy_extract_vertical_tables(text)))
+    extractor = new_extractor(text)
+    _, current_time = timed(lambda: (extractor.extract_general_tables(), extractor.extract_vertical_tables()))
+    print(f"{'combined':9s} legacy {legacy_time:.3f}s  current {current_time:.3f}s  "
+          f"({legacy_time / current_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: peak memory of handling an uploaded PDF before and after buffer sharing
+
+"Before" emulates the previous behaviour, where every consumer of an upload (the
+cache hash, pdfminer, PyPDF2, the page counter) called file_object.read() and
+wrapped the result in a new io.BytesIO. "After" is the current PDFTableExtractor,
+which takes the upload's buffer once and shares it between all parsers.
+
+Two measurements are reported with tracemalloc:
+  * source handling alone, for a 64 MB upload spooled to a temporary file
+  * a full extract_tables() run on samples/test6.pdf with text_source="pypdf2"
+
+In-memory io.BytesIO uploads were already shared by CPython on a whole read(), so
+the saving shows up for file-backed uploads, which are now memory-mapped. Mapped
+pages live in the OS page cache and are not counted by tracemalloc.
+
+Run from the repository root:
+    python benchmarks/bench_upload_memory.py
+"""
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_processor import PDFTableExtractor
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples", "test6.pdf")
+
+
+class CopyingExtractor(PDFTableExtractor):
+    """The previous behaviour: each consumer re-reads and copies the upload"""
+    def get_pdf_data(self):
+        self.file_object.seek(0)
+        return self.file_object.read()
+
+    def open_pdf_stream(self):
+        return io.BytesIO(self.get_pdf_data())
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def handle_source(extractor_class, upload):
+    extractor = extractor_class(file_object=upload)
+    hashlib.sha256(extractor.get_pdf_data()).hexdigest()
+    # Hold a stream per parser, as during a layout pass followed by a PyPDF2 pass
+    streams = [extractor.open_pdf_stream() for _ in range(3)]
+    for stream in streams:
+        stream.seek(0, io.SEEK_END)
+    return streams
+
+
+def extract(extractor_class, upload):
+    extractor_class(file_object=upload, text_source="pypdf2").extract_tables()
+
+
+def main():
+    with tempfile.TemporaryFile() as upload, open(SAMPLE, "rb") as sample:
+        upload.write(os.urandom(64 * 1024 * 1024))
+
+        for label, fn in [
+            ("source handling, 64 MB upload", lambda cls: handle_source(cls, upload)),
+            ("extract_tables, test6.pdf", lambda cls: extract(cls, sample)),
+        ]:
+            before = peak_memory(lambda: fn(CopyingExtractor))
+            after = peak_memory(lambda: fn(PDFTableExtractor))
+            print(f"{label:32s} before {before / 2**20:8.2f} MB  after {after / 2**20:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
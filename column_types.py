@@ -0,0 +1,241 @@
+import numpy as np
+import pandas as pd
+
+# Amounts: an optional sign or parentheses, an optional currency symbol, digits with
+# thousands separators (Western 1,234,567 or Indian 12,34,567), optional decimals and
+# an optional Dr/Cr flag. Debits, like negative and parenthesized amounts, become
+# negative. Other comma groupings, such as the European decimal "12,34", stay text.
+AMOUNT_PATTERN = (r'^(?P<open>\()?\s*(?P<sign>[-+])?\s*(?P<symbol>[$€£₹]|Rs\.?|INR|USD|EUR|GBP)?\s*'
+                  r'(?P<number>(?:\d{1,3}(?:,\d{3})+|\d{1,2}(?:,\d{2})*,\d{3})(?:\.\d+)?|\d+(?:\.\d+)?|\.\d+)'
+                  r'\s*(?P<close>\))?\s*'
+                  r'(?P<trailing_sign>-)?\s*(?P<flag>[DdCc][Rr])?\.?$')
+
+# Cheap check that every value looks like a date before trying each format
+DATE_SHAPE_PATTERN = r'^\d{1,4}[-/. ][0-9A-Za-z]{1,9}[-/. ]\d{2,4}$'
+
+# Tried in order; the first format that parses every value in a column wins, so
+# day-first formats take precedence as in the statements this tool reads
+DATE_FORMATS = ["%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y", "%d-%b-%Y", "%d/%b/%Y", "%d %b %Y", "%d-%m-%y",
+                "%d/%m/%y", "%d-%b-%y", "%d %b %y", "%Y-%m-%d", "%Y/%m/%d", "%d %B %Y"]
+
+# Longer digit runs are identifiers (account or card numbers) rather than quantities
+MAX_NUMBER_DIGITS = 15
+
+# Text columns become categoricals when at most this share of their values is
+# distinct and the categorical is smaller than the strings
+MAX_CATEGORY_RATIO = 0.5
+
+# Columns are first tried on this many leading values, so text columns are
+# rejected without running every parser over all of their rows
+SAMPLE_ROWS = 64
+
+NUMERIC_KINDS = ("integer", "number", "currency")
+
+
+def convert_table_types(tables, promote_header=True):
+    """
+    Convert every table in a dictionary of extracted tables with infer_table_types
+    """
+    return {table_name: infer_table_types(df, promote_header) for table_name, df in tables.items()}
+
+
+def infer_table_types(df, promote_header=True):
+    """
+    Give a table of extracted strings typed columns
+
+    Columns whose non-empty cells all parse as amounts become int64 or float64
+    (float64 when cells are empty), "1,234.50 Dr", "(50.00)" and "-50" becoming
+    negative; columns of dates in one format become datetime64; other columns of
+    repeated strings, such as Dr/Cr flags or transaction types, become
+    categoricals. Everything else is left as it was. Columns that are not object
+    dtype, such as dates already parsed by the bank statement strategy, are kept.
+
+    Detected tables carry their header as the first row. With promote_header, a
+    first row of text without digits above columns that only type without it
+    becomes the column names.
+
+    The result's attrs hold "column_types" (column name to "integer", "number",
+    "currency", "date", "category" or "text") and "text_bytes", the memory the
+    table used before conversion; see memory_report.
+
+    Args:
+        df: DataFrame as returned by PDFTableExtractor
+        promote_header: Use a header row found as described above as column names
+
+    Returns:
+        A new DataFrame; df is not modified
+    """
+    text_bytes = int(df.memory_usage(index=True, deep=True).sum())
+    values = [column_strings(df.iloc[:, position]) if df.dtypes.iloc[position] == object else None
+              for position in range(df.shape[1])]
+    columns = df.columns
+
+    if promote_header and isinstance(columns, pd.RangeIndex) and len(df) > 1:
+        header = [column.iloc[0] if column is not None else "" for column in values]
+        if any(header) and not any(char.isdigit() for cell in header for char in cell):
+            body = [infer_column(column.iloc[1:].reset_index(drop=True)) if column is not None else None
+                    for column in values]
+            if any(result is not None and result[0] in NUMERIC_KINDS + ("date",) and cell
+                   for result, cell in zip(body, header)):
+                names = [cell or str(position) for position, cell in enumerate(header)]
+                return typed_frame(df.iloc[1:].reset_index(drop=True), body, names, text_bytes)
+
+    return typed_frame(df, [infer_column(column) if column is not None else None for column in values],
+                       list(columns), text_bytes)
+
+
+def typed_frame(df, results, names, text_bytes):
+    """
+    Assemble the converted columns (None where a column is kept) into a DataFrame
+    """
+    converted = {}
+    kinds = {}
+    for position, (name, result) in enumerate(zip(names, results)):
+        if result is None:
+            column = df.iloc[:, position]
+            kind = existing_kind(column)
+        else:
+            kind, column = result
+            if column is None:
+                column = df.iloc[:, position]
+            if kind == "text":
+                kind, column = categorize(column)
+        converted[position] = column
+        kinds[str(name)] = kind
+
+    typed = pd.DataFrame(converted)
+    typed.columns = names
+    typed.attrs["column_types"] = kinds
+    typed.attrs["text_bytes"] = text_bytes
+    return typed
+
+
+def existing_kind(column):
+    """
+    Kind of a column that already had a type other than object
+    """
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return "date"
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return "category"
+    if pd.api.types.is_integer_dtype(column):
+        return "integer"
+    if pd.api.types.is_numeric_dtype(column):
+        return "number"
+    return "text"
+
+
+def column_strings(column):
+    """
+    A column's cells as stripped strings, with missing cells as empty strings
+    """
+    return column.where(column.notna(), "").astype(str).str.strip()
+
+
+def infer_column(values):
+    """
+    Infer the type of one column of stripped strings
+
+    Returns:
+        (kind, converted Series), or ("text", None) when the strings stay as they are
+    """
+    missing = values == ""
+    present = values[~missing]
+    if present.empty:
+        return "text", None
+
+    amounts = parse_amounts(present)
+    if amounts is not None:
+        kind, numbers = amounts
+        # int64 has no missing value, so integer columns with gaps stay float64
+        if kind == "integer" and not missing.any():
+            return kind, numbers.astype(np.int64)
+        return kind, numbers.reindex(values.index)
+
+    dates = parse_dates(present)
+    if dates is not None:
+        return "date", dates.reindex(values.index)
+
+    return "text", None
+
+
+def parse_amounts(present):
+    """
+    Parse non-empty strings as amounts, or return None unless every one of them is
+
+    Returns:
+        (kind, float64 Series) where kind is "integer", "number" or "currency"
+    """
+    if len(present) > SAMPLE_ROWS and parse_amounts(present.iloc[:SAMPLE_ROWS]) is None:
+        return None
+
+    parts = present.str.extract(AMOUNT_PATTERN)
+    if parts["number"].isna().any():
+        return None
+
+    digits = parts["number"].str.replace(",", "", regex=False)
+    # Zero-padded codes and long identifiers keep their text
+    if (digits.str.len() > MAX_NUMBER_DIGITS).any() or digits.str.match(r'0\d').any():
+        return None
+
+    negative = ((parts["sign"] == "-") | parts["open"].notna() | parts["close"].notna() |
+                parts["trailing_sign"].notna() | (parts["flag"].str.lower() == "dr"))
+    numbers = digits.astype(np.float64)
+    numbers = numbers.where(~negative, -numbers)
+
+    if parts["symbol"].notna().any() or parts["flag"].notna().any():
+        return "currency", numbers
+    if not digits.str.contains(".", regex=False).any():
+        return "integer", numbers
+    return "number", numbers
+
+
+def parse_dates(present):
+    """
+    Parse non-empty strings as dates in the first DATE_FORMATS entry that fits all of them
+    """
+    if len(present) > SAMPLE_ROWS and parse_dates(present.iloc[:SAMPLE_ROWS]) is None:
+        return None
+    if not present.str.match(DATE_SHAPE_PATTERN).all():
+        return None
+
+    for date_format in DATE_FORMATS:
+        dates = pd.to_datetime(present, format=date_format, errors="coerce")
+        if dates.notna().all():
+            return dates
+    return None
+
+
+def categorize(column):
+    """
+    Turn a text column of repeated values into a categorical when that saves memory
+
+    Returns:
+        (kind, Series): ("category", categorical) or ("text", column unchanged)
+    """
+    if column.dtype != object or len(column) < 2 or column.nunique() > MAX_CATEGORY_RATIO * len(column):
+        return "text", column
+
+    categorical = column.astype("category")
+    if categorical.memory_usage(index=False, deep=True) >= column.memory_usage(index=False, deep=True):
+        return "text", column
+    return "category", categorical
+
+
+def memory_report(tables):
+    """
+    Memory used by tables before and after infer_table_types
+
+    Returns:
+        Dictionary with "text_bytes" (before), "typed_bytes" (after) and a count of
+        converted columns per kind
+    """
+    report = {"text_bytes": 0, "typed_bytes": 0, "columns": {}}
+    for df in tables.values():
+        typed_bytes = int(df.memory_usage(index=True, deep=True).sum())
+        report["typed_bytes"] += typed_bytes
+        # Tables that were not converted used the same memory before
+        report["text_bytes"] += df.attrs.get("text_bytes", typed_bytes)
+        for kind in df.attrs.get("column_types", {}).values():
+            report["columns"][kind] = report["columns"].get(kind, 0) + 1
+    return report
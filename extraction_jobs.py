@@ -0,0 +1,148 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from pdf_processor import STRATEGIES, PDFTableExtractor
+
+
+class ExtractionJob:
+    """
+    State of one background extraction, updated page by page as layout analysis runs
+    """
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.status = "queued"
+        self.page_count = 0
+        self.pages_done = 0
+        self.partial_tables = {}
+        self.tables = None
+        self.error = None
+        self.events = []
+        self.created_at = time.time()
+        self.finished_at = None
+        self.lock = threading.Lock()
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed")
+
+    def add_event(self, kind, **details):
+        with self.lock:
+            self.events.append({"time": time.time(), "kind": kind, **details})
+
+    def snapshot(self):
+        """
+        Consistent copy of the job state that is safe to read from another thread
+        """
+        with self.lock:
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "page_count": self.page_count,
+                "pages_done": self.pages_done,
+                "partial_tables": dict(self.partial_tables),
+                "tables": dict(self.tables) if self.tables is not None else None,
+                "error": self.error,
+                "events": list(self.events),
+            }
+
+
+class ExtractionJobManager:
+    """
+    Runs PDFTableExtractor jobs on a background executor and tracks their progress
+
+    Layout tables are detected as each page comes out of the layout loop, so a
+    caller polling the job can render them before the whole document is done.
+    The final result is the same dictionary extract_tables returns, built from
+    those same per-page detections.
+    """
+    def __init__(self, max_workers=2, max_finished_jobs=100):
+        """
+        Args:
+            max_workers: Number of extractions that may run at once
+            max_finished_jobs: Completed jobs kept around for polling before being dropped
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="extraction")
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, pdf_bytes, on_complete=None, **extractor_options):
+        """
+        Queue extraction of a PDF and return its job id immediately
+
+        Args:
+            pdf_bytes: Contents of the PDF
+            on_complete: Optional callable invoked with the final tables on success.
+                If it returns True, such as when it stored them in a cache, the
+                finished job drops its own copy and its tables read as None
+            **extractor_options: Passed through to PDFTableExtractor
+        """
+        job = ExtractionJob(uuid.uuid4().hex)
+        with self.lock:
+            self._prune_finished_jobs()
+            self.jobs[job.job_id] = job
+
+        self.executor.submit(self._run, job, pdf_bytes, on_complete, extractor_options)
+        return job.job_id
+
+    def get(self, job_id):
+        """
+        Return the job with this id, or None if it is unknown or was pruned
+        """
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def _run(self, job, pdf_bytes, on_complete, extractor_options):
+        with PDFTableExtractor(pdf_data=pdf_bytes, **extractor_options) as processor:
+            self._extract(job, processor, on_complete)
+
+    def _extract(self, job, processor, on_complete):
+        # Live previews come from layout detection, which a text-only strategy never uses
+        preview_pages = processor.strategy == "auto" or STRATEGIES[processor.strategy].needs_layout
+
+        def on_page(layout, page_tables=()):
+            with job.lock:
+                job.pages_done = layout.page_num + 1
+                job.partial_tables.update(page_tables)
+            job.add_event("page", page=layout.page_num + 1, tables=[name for name, _ in page_tables])
+
+        try:
+            page_count = processor.get_page_count()
+            with job.lock:
+                job.status = "running"
+                job.page_count = page_count
+            job.add_event("started", page_count=page_count)
+
+            # Pages are reported as the layout loop finishes them, with the tables
+            # layout detection found on them; text-based fallbacks reuse the layout
+            if preview_pages:
+                tables = processor.extract_tables(progress_callback=on_page)
+            else:
+                processor.extract_layout_elements(progress_callback=on_page)
+                tables = processor.extract_tables()
+
+            # Handed over before the job reads as done, so pollers find them where
+            # on_complete put them; finished jobs are kept for polling, and holding
+            # every result would bypass the cache's memory budget
+            handed_off = bool(on_complete(tables)) if on_complete else False
+
+            with job.lock:
+                job.tables = None if handed_off else tables
+                job.partial_tables = {}
+                job.status = "done"
+                job.finished_at = time.time()
+            job.add_event("done", tables=len(tables))
+        except Exception as e:
+            with job.lock:
+                job.error = str(e)
+                job.partial_tables = {}
+                job.status = "failed"
+                job.finished_at = time.time()
+            job.add_event("failed", error=str(e))
+
+    def _prune_finished_jobs(self):
+        finished = sorted((job for job in self.jobs.values() if job.done), key=lambda job: job.finished_at)
+        for job in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job.job_id]
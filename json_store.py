@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+import threading
+
+
+class JsonStore:
+    """
+    Dictionary of JSON-serializable entries, optionally persisted to a JSON file
+
+    Several processes can share the file: every write first merges in entries
+    other processes saved since, then replaces the file through a temporary file
+    and a rename, so readers never see a partial file. Instances pickle by path
+    and entries, so they can be sent to worker processes.
+    """
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Optional JSON file where the entries are kept across runs
+        """
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+
+        if self.path and os.path.exists(self.path):
+            self.entries = self._load()
+
+    def __getstate__(self):
+        # Locks can't be pickled
+        return {"path": self.path, "entries": dict(self.entries)}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+        self.entries.update(state["entries"])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def update(self, entries, replace=True):
+        """
+        Add entries and save them
+
+        Args:
+            entries: Dictionary of keys to values
+            replace: Overwrite the value of keys already present; otherwise only
+                new keys are added
+
+        Returns:
+            True if any entry was added or changed
+        """
+        with self.lock:
+            changed = {key: value for key, value in entries.items()
+                       if (replace or key not in self.entries) and self.entries.get(key) != value}
+            if not changed:
+                return False
+            self.entries.update(changed)
+
+            if self.path:
+                # Merge with entries written by other processes since we loaded
+                merged = self._load() if os.path.exists(self.path) else {}
+                merged.update(self.entries)
+                self.entries = merged
+                self._save()
+            return True
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                json.dump(self.entries, file, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
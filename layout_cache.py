@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+# Bump whenever the stored arrays change meaning, to ignore older entries
+LAYOUT_CACHE_VERSION = 1
+
+# Bytes of the PDF hashed at a time when building a key
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class LayoutCache:
+    """
+    On-disk cache of pdfminer layout analysis results
+
+    Entries are keyed on the SHA-256 of the PDF bytes plus the LAParams used, and
+    stored as one uncompressed .npz of flat arrays per document (see
+    PageLayout.pack), so loading a cached layout takes milliseconds instead of a
+    full pdfminer pass. Table detection settings are not part of the key: re-runs
+    with tuned detection thresholds reuse the same entry.
+
+    Building a key reads the whole PDF, even when only some pages are analyzed,
+    so a memory-mapped file is read from disk once per lookup. It is hashed in
+    chunks, which keeps only one chunk at a time in the process's memory.
+    Hashing costs about 0.1 s per 100 MB, plus reading any part of the file
+    that is not already in the OS page cache.
+    """
+    def __init__(self, cache_dir):
+        """
+        Args:
+            cache_dir: Directory holding the cached layouts
+        """
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def __getstate__(self):
+        # Sent to worker processes by path; locks can't be pickled
+        return {"cache_dir": self.cache_dir}
+
+    def __setstate__(self, state):
+        self.__init__(state["cache_dir"])
+
+    @staticmethod
+    def make_key(pdf_bytes, laparams=None):
+        """
+        Build a cache key from the PDF content and the LAParams keyword arguments
+        """
+        digest = hashlib.sha256()
+        with memoryview(pdf_bytes) as view:
+            for start in range(0, view.nbytes, HASH_CHUNK_SIZE):
+                digest.update(view[start:start + HASH_CHUNK_SIZE])
+        digest.update(json.dumps({"version": LAYOUT_CACHE_VERSION, "laparams": laparams or {}},
+                                 sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def __contains__(self, key):
+        return os.path.exists(self._entry_path(key))
+
+    def get(self, key):
+        """
+        Return the cached arrays for key as a dictionary, or None on a miss
+        """
+        try:
+            with np.load(self._entry_path(key)) as entry:
+                arrays = {name: entry[name] for name in entry.files}
+        except (OSError, ValueError, KeyError):
+            arrays = None
+
+        with self.lock:
+            if arrays is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return arrays
+
+    def put(self, key, arrays):
+        """
+        Store a dictionary of arrays under key
+
+        A failed write, such as a full disk, leaves the entry uncached rather than
+        failing the extraction; the next lookup is a miss.
+        """
+        # Write to a temporary file and rename so readers never see partial entries
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-", suffix=".npz")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                np.savez(file, **arrays)
+            os.replace(temp_path, self._entry_path(key))
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def stats(self):
+        """
+        Hit and miss counters plus the number of cached documents
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": sum(1 for name in os.listdir(self.cache_dir) if name.endswith(".npz")
+                               and not name.startswith(".tmp-")),
+            }
+
+    def clear(self):
+        """
+        Remove every cached layout
+        """
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".npz"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
@@ -1,350 +1,1604 @@
 import re
+import bisect
 import pandas as pd
+import numpy as np
 import io
 import os
+import mmap
+import sys
+import glob
+import time
+import argparse
+import tempfile
+import weakref
+import xlsxwriter
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 from PyPDF2 import PdfReader
 from pdfminer.high_level import extract_pages
-from pdfminer.layout import LTTextBox, LTTextLine, LTLine, LTRect, LTFigure, LTChar
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.layout import LAParams, LTTextBox, LTTextLine, LTLine, LTRect, LTFigure, LTChar
 from pdfminer.utils import Rect
 from collections import defaultdict
+from layout_cache import LayoutCache
+from strategy_planner import StrategyPlanner
+from template_index import TemplateIndex, header_labels
+from table_stitcher import TableFragment, TableStitcher
+from column_types import convert_table_types, infer_table_types, memory_report
+
+# Bump whenever detection logic changes in a way that alters extracted tables
+EXTRACTOR_VERSION = "1.2"
+
+# Named pdfminer layout analysis settings, trading speed against fidelity; see the
+# README for numbers measured with benchmarks/bench_layout_profiles.py
+LAYOUT_PROFILES = {
+    # Skips boxes_flow hierarchical grouping of text boxes
+    "fast": {"boxes_flow": None},
+    # pdfminer's defaults
+    "balanced": {},
+    # Also analyzes vertical text and text inside figures
+    "accurate": {"detect_vertical": True, "all_texts": True},
+}
+
+# Columns of the (n, 4) bounding box arrays held by PageLayout
+X0, Y0, X1, Y1 = range(4)
+
+TRANSACTION_PATTERN = r'(\d{2}[-/]\w{3}[-/]\d{4}|\d{2}[-/]\d{2}[-/]\d{4})\s+(.*?)\s+([\d,.]+\.\d{2})\s+(.*?Dr|.*?Cr)'
+SIMPLE_TRANSACTION_PATTERN = r'(\d{2}[-/]\w{3}[-/]\d{4}|\d{2}[-/]\d{2}[-/]\d{4})\s+([A-Z].*?)\s+([\d,.]+\.\d{2})'
+
+# Compiled once at import; the text extractors look patterns up here instead of
+# passing literal pattern strings to re inside their per-line loops
+PATTERNS = {
+    # Document type detection
+    "code_marker": re.compile(r'\$\d+\s+\$\s+\$\d+\s+\$'),
+    # Bank statements
+    "statement_sections": re.compile(r'Page No: \d+|Statement of account'),
+    "transaction": re.compile(TRANSACTION_PATTERN),
+    "simple_transaction": re.compile(SIMPLE_TRANSACTION_PATTERN),
+    # Bank statements, whole document at once: each line is tried against the full
+    # transaction pattern and only then the simple one, like two per-line searches.
+    # Group 1 captures the whole line; \s is narrowed so no match spans lines.
+    "transaction_lines": re.compile(
+        r'^(?=([^\n]*))(?:[^\n]*?' + TRANSACTION_PATTERN.replace(r'\s', r'[^\S\n]') +
+        r'|[^\n]*?' + SIMPLE_TRANSACTION_PATTERN.replace(r'\s', r'[^\S\n]') + r')',
+        re.MULTILINE,
+    ),
+    # Key-value pairs
+    "key_value": re.compile(r'([A-Za-z0-9\s\./]+)\s*[:]\s*(.+)'),
+    # Code-based tables
+    "code_row": re.compile(r'\$\d+\s+\$\s+\$\d+\s+\$\s+[A-Za-z0-9\*\-]+\s+'),
+    # Line classification; equivalent to ^\s*[A-Za-z\s]+\s*$, (\d+\s+){2,} and
+    # (\$[\d,.]+\s+){2,} on stripped lines, without the repeated-group backtracking
+    "digit": re.compile(r'\d'),
+    "header": re.compile(r'[A-Za-z\s]+'),
+    "numeric_row": re.compile(r'\d\s+\d+\s'),
+    "currency_row": re.compile(r'\$[\d,.]+\s+\$[\d,.]+\s'),
+    # Column and section splitting
+    "multi_space": re.compile(r'\s{2,}'),
+    "section_rule": re.compile(r'-{5,}|={5,}|\*{5,}'),
+    # Rectangle and line segment operators in a decoded page content stream
+    "shape_operator": re.compile(rb'\s(?:re|l)\s'),
+}
+
+# Tags assigned to each line by classify_lines, combined as bit flags
+LINE_HEADER = 1
+LINE_HAS_DIGIT = 2
+LINE_NUMERIC_ROW = 4
+LINE_CURRENCY_ROW = 8
+LINE_DELIMITED = 16
+
+
+def classify_document_text(text):
+    """
+    Classify a document's text as "bank_statement", "code_based" or "general"
+    """
+    if "BANK NAME" in text or "Statement of account" in text:
+        return "bank_statement"
+    elif PATTERNS["code_marker"].search(text):
+        return "code_based"
+    else:
+        return "general"
+
+
+def classify_lines(lines):
+    """
+    Tag each line once with the features the text extractors test for
+    
+    Args:
+        lines: List of stripped, non-empty lines
+        
+    Returns:
+        List of bit-flag tags, parallel to lines
+    """
+    digit = PATTERNS["digit"].search
+    header = PATTERNS["header"].fullmatch
+    numeric_row = PATTERNS["numeric_row"].search
+    currency_row = PATTERNS["currency_row"].search
+    
+    tags = []
+    for line in lines:
+        tag = 0
+        if digit(line):
+            tag |= LINE_HAS_DIGIT
+            if numeric_row(line):
+                tag |= LINE_NUMERIC_ROW
+        elif header(line):
+            # A header line has no digits, so it can never be a numeric row
+            tag |= LINE_HEADER
+        # Checked whatever the digits: "$.. $, x" is a currency row too
+        if "$" in line and currency_row(line):
+            tag |= LINE_CURRENCY_ROW
+        if "|" in line or "," in line or "\t" in line:
+            tag |= LINE_DELIMITED
+        tags.append(tag)
+    return tags
+
+
+class ExtractionStrategy:
+    """
+    A table extraction method registered in STRATEGIES, with its declared cost and
+    the document types it applies to
+    """
+    def __init__(self, name, function, cost, table_types=None, needs_layout=False, supplement=False,
+                 description=""):
+        """
+        Args:
+            name: Registry key, also accepted as PDFTableExtractor's strategy option
+            function: PDFTableExtractor method implementing the strategy
+            cost: Rough milliseconds per page on the sample documents, used to try
+                cheaper strategies first
+            table_types: detect_table_type() results the strategy applies to, or None for any
+            needs_layout: The strategy reads page layouts rather than pdf_text, and is
+                passed the page numbers to detect tables on
+            supplement: Run after the main strategy and merge its tables in, rather
+                than as an alternative to it
+            description: Short label shown in the UI
+        """
+        self.name = name
+        self.function = function
+        self.cost = cost
+        self.table_types = table_types
+        self.needs_layout = needs_layout
+        self.supplement = supplement
+        self.description = description
+    
+    def applies_to(self, table_type):
+        return self.table_types is None or table_type in self.table_types
+    
+    def run(self, extractor, page_numbers=None):
+        """
+        Run the strategy on a PDFTableExtractor, extracting the text it needs first
+        
+        Returns:
+            Dictionary with table names as keys and DataFrames as values
+        """
+        if self.needs_layout:
+            return self.function(extractor, page_numbers)
+        
+        if not extractor.pdf_text:
+            extractor.extract_text(page_numbers=page_numbers)
+        return self.function(extractor)
+
+
+# Every table extraction strategy, by name, in registration order
+STRATEGIES = {}
+
+
+def register_strategy(name, cost, table_types=None, needs_layout=False, supplement=False, description=""):
+    """
+    Decorator registering a PDFTableExtractor method as an extraction strategy
+    """
+    def register(function):
+        STRATEGIES[name] = ExtractionStrategy(name, function, cost, table_types, needs_layout, supplement,
+                                              description)
+        return function
+    return register
+
+
+def get_strategies(table_type=None, needs_layout=None, supplement=None):
+    """
+    Registered strategies applicable to table_type, cheapest first
+    
+    Args:
+        table_type: A detect_table_type() result, or None for every strategy
+        needs_layout: If not None, only strategies whose needs_layout matches
+        supplement: If not None, only strategies whose supplement flag matches
+    """
+    strategies = [strategy for strategy in STRATEGIES.values()
+                  if (table_type is None or strategy.applies_to(table_type)) and
+                  (needs_layout is None or strategy.needs_layout == needs_layout) and
+                  (supplement is None or strategy.supplement == supplement)]
+    return sorted(strategies, key=lambda strategy: strategy.cost)
+
+
+def _extract_page_range_tables(file_path, pdf_bytes, page_numbers, layout_profile="balanced",
+                               template_key=None, template=None):
+    """
+    Worker entry point for parallel extraction: layout analysis and table
+    detection for a subset of pages. Module-level so it can be pickled.
+    
+    The document's template is looked up by the parent, from page 0, and passed
+    in as its fingerprint and plan (None when the index doesn't know it yet).
+    
+    Returns:
+        List of (PageLayout, fragments) pairs, so the parent can keep and cache
+        the layouts and stitch tables continuing across page ranges, and the plan
+        and table size this range would teach the template index (None and 0 if
+        nothing); the parent keeps the largest and stores it once
+    """
+    with PDFTableExtractor(file_path=file_path, pdf_data=None if file_path else pdf_bytes,
+                           layout_profile=layout_profile) as extractor:
+        extractor._template_key = template_key
+        extractor._template = template
+        pages = [(layout, extractor.page_table_fragments(layout))
+                 for layout in extractor.iter_layout_pages(page_numbers)]
+    return pages, extractor._template_plan, extractor._template_cells
+
+
+def extract_pdf_tables(pdf_data, **extractor_options):
+    """
+    Extract all tables from one in-memory PDF; the worker entry point for batch
+    extraction in a process pool. Module-level so it can be pickled.
+    
+    A template_index passed in reaches the worker as a copy, so the plans it holds
+    after extraction are returned too, for the parent to TemplateIndex.merge.
+    
+    Args:
+        pdf_data: PDF contents
+        **extractor_options: Passed through to PDFTableExtractor
+    
+    Returns:
+        Tuple of the tables and the template_index's plans ({} without an index)
+    """
+    with PDFTableExtractor(pdf_data=pdf_data, **extractor_options) as processor:
+        tables = processor.extract_tables()
+    template_index = extractor_options.get("template_index")
+    return tables, dict(template_index.plans) if template_index is not None else {}
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Read-only, seekable file object over a bytes-like buffer (memoryview, mmap, bytearray)
+    
+    Unlike io.BytesIO, which copies anything that isn't a bytes object, reads are
+    served straight from the shared buffer and only the requested range is copied.
+    """
+    def __init__(self, buffer):
+        self.buffer = memoryview(buffer).cast('B')
+        self.position = 0
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def tell(self):
+        return self.position
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self.position = offset
+        elif whence == io.SEEK_CUR:
+            self.position += offset
+        elif whence == io.SEEK_END:
+            self.position = len(self.buffer) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        
+        if self.position < 0:
+            raise ValueError("Negative seek position")
+        return self.position
+    
+    def readinto(self, target):
+        chunk = self.buffer[self.position:self.position + len(target)]
+        target[:len(chunk)] = chunk
+        self.position += len(chunk)
+        return len(chunk)
+    
+    def read(self, size=-1):
+        end = len(self.buffer) if size is None or size < 0 else self.position + size
+        data = self.buffer[self.position:end].tobytes()
+        self.position += len(data)
+        return data
+    
+    def close(self):
+        self.buffer.release()
+        super().close()
+
+
+class PageLayout:
+    """
+    Compact layout of one page: float32 (x0, y0, x1, y1) arrays for the text boxes,
+    lines and rectangles, plus a parallel list of the text box strings
+    
+    Built while pdfminer's page is walked, so the LTTextBox/LTTextLine/LTChar trees
+    (hundreds of bytes per glyph) are released as soon as the page has been read.
+    """
+    __slots__ = ("page_num", "boxes", "texts", "lines", "rects", "row_indexes")
+    
+    def __init__(self, page_num, boxes, texts, lines, rects):
+        self.page_num = page_num
+        self.boxes = boxes
+        self.texts = texts
+        self.lines = lines
+        self.rects = rects
+        # Row orderings built by PDFTableExtractor.build_row_index, keyed by threshold
+        self.row_indexes = {}
+    
+    @classmethod
+    def from_page(cls, page_num, page):
+        """
+        Build the compact layout from a pdfminer LTPage
+        """
+        box_bboxes = []
+        texts = []
+        line_bboxes = []
+        rect_bboxes = []
+        
+        for element in page:
+            # Categorize elements
+            if isinstance(element, LTTextBox):
+                box_bboxes.append(element.bbox)
+                texts.append(element.get_text())
+            elif isinstance(element, LTLine):
+                line_bboxes.append(element.bbox)
+            elif isinstance(element, LTRect):
+                rect_bboxes.append(element.bbox)
+        
+        return cls(page_num, cls.bbox_array(box_bboxes), texts,
+                   cls.bbox_array(line_bboxes), cls.bbox_array(rect_bboxes))
+    
+    @staticmethod
+    def bbox_array(bboxes):
+        return np.array(bboxes, dtype=np.float32).reshape(-1, 4)
+    
+    def get_text(self):
+        return "".join(self.texts)
+    
+    @staticmethod
+    def pack(layouts):
+        """
+        Flatten page layouts into a few arrays, concatenated across pages with
+        per-page counts, for storage in a LayoutCache
+        """
+        texts = [text for layout in layouts for text in layout.texts]
+        return {
+            "page_nums": np.array([layout.page_num for layout in layouts], dtype=np.int32),
+            "box_counts": np.array([len(layout.boxes) for layout in layouts], dtype=np.int32),
+            "line_counts": np.array([len(layout.lines) for layout in layouts], dtype=np.int32),
+            "rect_counts": np.array([len(layout.rects) for layout in layouts], dtype=np.int32),
+            "boxes": np.concatenate([PageLayout.bbox_array([])] + [layout.boxes for layout in layouts]),
+            "lines": np.concatenate([PageLayout.bbox_array([])] + [layout.lines for layout in layouts]),
+            "rects": np.concatenate([PageLayout.bbox_array([])] + [layout.rects for layout in layouts]),
+            # All box texts as one UTF-8 buffer plus each text's length in characters;
+            # pdfminer can emit lone surrogates for broken ToUnicode maps, which
+            # surrogatepass keeps as one character each
+            "text": np.frombuffer("".join(texts).encode("utf-8", "surrogatepass"), dtype=np.uint8),
+            "text_lengths": np.array([len(text) for text in texts], dtype=np.int64),
+        }
+    
+    @classmethod
+    def unpack(cls, arrays):
+        """
+        Rebuild the page layouts stored by pack
+        """
+        all_text = arrays["text"].tobytes().decode("utf-8", "surrogatepass")
+        text_ends = np.cumsum(arrays["text_lengths"]).tolist()
+        text_starts = [0] + text_ends[:-1]
+        texts = [all_text[start:end] for start, end in zip(text_starts, text_ends)]
+        
+        box_offsets = np.cumsum(arrays["box_counts"]).tolist()
+        line_offsets = np.cumsum(arrays["line_counts"]).tolist()
+        rect_offsets = np.cumsum(arrays["rect_counts"]).tolist()
+        
+        layouts = []
+        box_start = line_start = rect_start = 0
+        for page_num, box_end, line_end, rect_end in zip(arrays["page_nums"].tolist(), box_offsets,
+                                                         line_offsets, rect_offsets):
+            layouts.append(cls(page_num, arrays["boxes"][box_start:box_end], texts[box_start:box_end],
+                               arrays["lines"][line_start:line_end], arrays["rects"][rect_start:rect_end]))
+            box_start, line_start, rect_start = box_end, line_end, rect_end
+        return layouts
+
+
+class TextBoxGridIndex:
+    """
+    Grid-bucket spatial index over text box bounding boxes for containment queries
+    
+    Each box is bucketed by the grid cell holding its lower-left corner. A box can
+    only lie inside a rectangle if that corner does, so a query only visits the
+    cells the rectangle overlaps instead of every box on the page. The visited
+    cells are clamped to the occupied ones, and a rectangle covering more cells
+    than there are buckets scans the buckets instead, so oversized background or
+    clip rectangles cost at most one pass over the boxes.
+    """
+    def __init__(self, boxes, cell_size=50):
+        """
+        Args:
+            boxes: (n, 4) array of text box x0, y0, x1, y1
+        """
+        self.boxes = boxes
+        self.cell_size = cell_size
+        self.buckets = defaultdict(list)
+        
+        cells = (boxes[:, [X0, Y0]] // cell_size).astype(int)
+        for index, cell in enumerate(map(tuple, cells.tolist())):
+            self.buckets[cell].append(index)
+        
+        # Range of occupied cells, to clamp queries to
+        if len(cells):
+            (self.min_cell_x, self.min_cell_y), (self.max_cell_x, self.max_cell_y) = (
+                cells.min(axis=0).tolist(), cells.max(axis=0).tolist())
+        else:
+            self.min_cell_x = self.min_cell_y = 0
+            self.max_cell_x = self.max_cell_y = -1
+    
+    def contained_in(self, rect):
+        """
+        Return the indexes of the boxes fully inside rect (x0, y0, x1, y1), in page order
+        """
+        cell_size = self.cell_size
+        rect_x0, rect_y0, rect_x1, rect_y1 = rect
+        first_x = max(int(rect_x0 // cell_size), self.min_cell_x)
+        last_x = min(int(rect_x1 // cell_size), self.max_cell_x)
+        first_y = max(int(rect_y0 // cell_size), self.min_cell_y)
+        last_y = min(int(rect_y1 // cell_size), self.max_cell_y)
+        candidates = []
+        
+        if (last_x - first_x + 1) * (last_y - first_y + 1) > len(self.buckets):
+            for (cell_x, cell_y), indexes in self.buckets.items():
+                if first_x <= cell_x <= last_x and first_y <= cell_y <= last_y:
+                    candidates.extend(indexes)
+        else:
+            for cell_x in range(first_x, last_x + 1):
+                for cell_y in range(first_y, last_y + 1):
+                    candidates.extend(self.buckets.get((cell_x, cell_y), ()))
+        
+        candidates = np.array(candidates, dtype=np.intp)
+        boxes = self.boxes[candidates]
+        inside = ((boxes[:, X0] >= rect_x0) & (boxes[:, X1] <= rect_x1) &
+                  (boxes[:, Y0] >= rect_y0) & (boxes[:, Y1] <= rect_y1))
+        
+        # Keep the page order so downstream sorting behaves as before
+        return np.sort(candidates[inside])
+
 
 class PDFTableExtractor:
     """
     Utility class for extracting tables from PDFs using pdfminer.six for more precise extraction
     """
-    def __init__(self, file_path=None, file_object=None):
+    def __init__(self, file_path=None, file_object=None, text_source="layout", pdf_data=None, use_mmap=True,
+                 layout_profile="balanced", layout_cache=None, strategy="auto", planner=None,
+                 template_index=None, stitch_tables=False, infer_types=False, page_workers=1):
         """
-        Initialize with either a file path or a file object
+        Initialize with a file path, a file object or the PDF contents
+
+        Args:
+            file_path: Path to the PDF on disk
+            file_object: Binary file-like object containing the PDF
+            pdf_data: PDF contents as bytes, bytearray, memoryview or mmap; shared by
+                every parser without being copied
+            text_source: "layout" builds pdf_text from the pdfminer text boxes so the
+                document is parsed only once; "pypdf2" re-reads it with PyPDF2
+            use_mmap: Memory-map file_path or file_object so parsers only fault in the
+                pages they read; with False the file is read with buffered file I/O
+            layout_profile: Name of a LAYOUT_PROFILES entry: "fast", "balanced" or "accurate"
+            layout_cache: Optional LayoutCache; documents whose layout was analyzed
+                before with the same LAParams skip pdfminer entirely
+            strategy: "auto" to try layout detection and then the text strategies for
+                the detected document type, or the name of a STRATEGIES entry to run
+                only that strategy
+            planner: Optional StrategyPlanner, only with text_source="pypdf2" (with
+                layout text every strategy needs the layout pass anyway); with
+                strategy="auto", strategies are tried in the order it plans from
+                cheap page-1 features, and the winner is recorded for later
+                documents of the same template
+            template_index: Optional TemplateIndex; documents whose first page
+                matches a known template have their borderless tables sliced by the
+                template's learned column boundaries instead of detected heuristically
+            stitch_tables: Join layout tables that continue onto the next page (same
+                column count and column positions) into a single table
+            infer_types: Convert the extracted tables' columns of amounts, dates and
+                repeated strings to numeric, datetime and categorical dtypes (see
+                column_types.infer_table_types)
+            page_workers: Number of processes layout detection is split across by
+                page range (see extract_tables_parallel); runs with max_tables or
+                stop_after_first_match stay in this process, as they stop early
         """
+        if text_source not in ("layout", "pypdf2"):
+            raise ValueError(f"Unknown text source: {text_source}")
+        if layout_profile not in LAYOUT_PROFILES:
+            raise ValueError(f"Unknown layout profile: {layout_profile}")
+        if strategy != "auto" and strategy not in STRATEGIES:
+            raise ValueError(f"Unknown extraction strategy: {strategy}")
+        if planner is not None and text_source != "pypdf2":
+            raise ValueError("A strategy planner requires text_source=\"pypdf2\"")
+        
         self.file_path = file_path
         self.file_object = file_object
+        self.text_source = text_source
+        self.pdf_data = pdf_data
+        self.use_mmap = use_mmap
+        self.layout_profile = layout_profile
+        self.layout_cache = layout_cache
+        self.strategy = strategy
+        self.planner = planner
+        self.template_index = template_index
+        self.stitch_tables = stitch_tables
+        self.infer_types = infer_types
+        self.page_workers = page_workers
+        self._mmap = None
+        self._layout_cache_key = None
+        # Readers over the mapping still open, e.g. in a generator that was not exhausted
+        self._buffer_readers = weakref.WeakSet()
         self.pdf_text = ""
         self.layout_elements = []
-        self.text_boxes = []
-        self.lines = []
-        self.rects = []
+        self._classified_lines = None
+        self._plan_features = None
+        # Fingerprint of page 1, the plan found for it (fixed for this document), and
+        # the plan of this document's largest table so far with its size, stored in
+        # the index by learn_template once the pass is over
+        self._template_key = None
+        self._template = None
+        self._template_plan = None
+        self._template_cells = 0
+        
+    def get_settings(self):
+        """
+        Settings that influence the extracted tables, used to key cached results
+        """
+        return {
+            "version": EXTRACTOR_VERSION,
+            "text_source": self.text_source,
+            "layout_profile": self.layout_profile,
+            "strategy": self.strategy,
+            "planned": self.planner is not None,
+            "templates": self.template_index is not None,
+            "stitch_tables": self.stitch_tables,
+            "infer_types": self.infer_types,
+        }
+    
+    def extract_text(self, page_numbers=None):
+        """
+        Extract text from PDF, either from the pdfminer layout or using PyPDF2
+        
+        Args:
+            page_numbers: Optional iterable of zero-based page indexes
+        """
+        if self.text_source == "layout":
+            return self.extract_text_from_layout(page_numbers)
+        
+        return self.extract_text_pypdf2(page_numbers)
+    
+    def extract_text_from_layout(self, page_numbers=None):
+        """
+        Build the PDF text from the page layouts collected by extract_layout_elements
+        
+        Args:
+            page_numbers: Optional iterable of zero-based page indexes
+        """
+        # Parse the layout once if it hasn't been done yet
+        if not self.layout_elements:
+            self.extract_layout_elements(page_numbers=page_numbers)
+        
+        selected_pages = set(page_numbers) if page_numbers is not None else None
         
-    def extract_text(self):
+        page_texts = []
+        for layout in self.layout_elements:
+            if selected_pages is not None and layout.page_num not in selected_pages:
+                continue
+            page_texts.append(layout.get_text())
+        
+        self.pdf_text = "\n\n".join(page_texts) + "\n\n" if page_texts else ""
+        return self.pdf_text
+    
+    def extract_text_pypdf2(self, page_numbers=None):
         """
         Extract text from PDF using PyPDF2
+        
+        Args:
+            page_numbers: Optional iterable of zero-based page indexes; other pages'
+                content streams are never read
         """
         try:
-            if self.file_path:
-                with open(self.file_path, 'rb') as file:
-                    reader = PdfReader(file)
-                    for page in reader.pages:
-                        self.pdf_text += page.extract_text() + "\n\n"
-            elif self.file_object:
-                # Save current position
-                position = self.file_object.tell()
-                # Reset to beginning
-                self.file_object.seek(0)
+            with self.open_pdf_stream() as stream:
+                reader = PdfReader(stream)
+                if page_numbers is None:
+                    pages = reader.pages
+                else:
+                    pages = [reader.pages[i] for i in sorted(set(page_numbers)) if i < len(reader.pages)]
                 
-                reader = PdfReader(self.file_object)
-                for page in reader.pages:
+                for page in pages:
                     self.pdf_text += page.extract_text() + "\n\n"
                 
-                # Reset file position to what it was
-                self.file_object.seek(position)
-            else:
-                raise ValueError("No file path or file object provided")
-                
             return self.pdf_text
         except Exception as e:
             raise Exception(f"Error extracting text from PDF: {str(e)}")
     
-    def extract_layout_elements(self):
+    def extract_layout_elements(self, progress_callback=None, page_numbers=None):
         """
         Extract layout elements (textboxes, lines, rectangles) using pdfminer.six
+        
+        Args:
+            progress_callback: Optional callable invoked with each page's PageLayout;
+                returning True stops the pass, so the remaining pages are never parsed
+            page_numbers: Optional iterable of zero-based page indexes to analyze
+        
+        Returns:
+            List of PageLayout objects, one per analyzed page
         """
         try:
             # Clear previous data
             self.layout_elements = []
-            self.text_boxes = []
-            self.lines = []
-            self.rects = []
-            
-            # Use the appropriate source
-            if self.file_path:
-                pages = extract_pages(self.file_path)
-            elif self.file_object:
-                # Save current position
-                position = self.file_object.tell()
-                # Reset to beginning
-                self.file_object.seek(0)
-                
-                pages = extract_pages(io.BytesIO(self.file_object.read()))
-                
-                # Reset file position to what it was
-                self.file_object.seek(position)
-            else:
-                raise ValueError("No file path or file object provided")
             
             # Process each page
-            for page_num, page in enumerate(pages):
-                page_elements = []
-                page_text_boxes = []
-                page_lines = []
-                page_rects = []
-                
-                # Extract all elements
-                for element in page:
-                    page_elements.append(element)
-                    
-                    # Categorize elements
-                    if isinstance(element, LTTextBox):
-                        page_text_boxes.append(element)
-                    elif isinstance(element, LTLine):
-                        page_lines.append(element)
-                    elif isinstance(element, LTRect):
-                        page_rects.append(element)
+            for layout in self.iter_layout_pages(page_numbers):
+                self.layout_elements.append(layout)
                 
-                # Store elements for this page
-                self.layout_elements.append(page_elements)
-                self.text_boxes.append(page_text_boxes)
-                self.lines.append(page_lines)
-                self.rects.append(page_rects)
+                if progress_callback and progress_callback(layout):
+                    break
                 
             return self.layout_elements
         except Exception as e:
             raise Exception(f"Error extracting layout elements: {str(e)}")
     
-    def detect_table_type(self):
+    def layout_cache_key(self):
+        """
+        Key of this PDF's layouts in the layout cache, hashed once per extractor
+        """
+        if self._layout_cache_key is None:
+            self._layout_cache_key = self.layout_cache.make_key(self.get_pdf_data(),
+                                                                LAYOUT_PROFILES[self.layout_profile])
+        return self._layout_cache_key
+    
+    def iter_layout_pages(self, page_numbers=None):
+        """
+        Lazily run pdfminer layout analysis, one page at a time
+        
+        Args:
+            page_numbers: Optional iterable of zero-based page indexes to analyze
+        
+        Yields:
+            A PageLayout for each page
+        """
+        laparams_options = LAYOUT_PROFILES[self.layout_profile]
+        cache_key = None
+        
+        if self.layout_cache is not None:
+            cache_key = self.layout_cache_key()
+            cached = self.layout_cache.get(cache_key)
+            if cached is not None:
+                selected_pages = set(page_numbers) if page_numbers is not None else None
+                for layout in PageLayout.unpack(cached):
+                    if selected_pages is None or layout.page_num in selected_pages:
+                        yield layout
+                return
+        
+        laparams = LAParams(**laparams_options)
+        # Only a complete pass over the whole document is stored in the layout cache
+        cached_layouts = [] if cache_key is not None and page_numbers is None else None
+        source = self.open_pdf_stream()
+        
+        try:
+            # pdfminer yields the selected pages in document order; maxpages stops it
+            # walking the page tree past the last one
+            if page_numbers is not None:
+                page_numbers = sorted(set(page_numbers))
+                if not page_numbers:
+                    return
+                pages = zip(page_numbers, extract_pages(source, page_numbers=page_numbers,
+                                                        maxpages=page_numbers[-1] + 1, laparams=laparams))
+            else:
+                pages = enumerate(extract_pages(source, laparams=laparams))
+            
+            for page_num, page in pages:
+                layout = PageLayout.from_page(page_num, page)
+                if cached_layouts is not None:
+                    cached_layouts.append(layout)
+                yield layout
+            
+            if cached_layouts is not None:
+                self.layout_cache.put(cache_key, PageLayout.pack(cached_layouts))
+        finally:
+            # pdfminer leaves file objects it was given open
+            source.close()
+    
+    def iter_tables(self, page_numbers=None):
+        """
+        Stream tables page by page without keeping the whole document's layout in memory
+        
+        Each page is pulled from pdfminer, run through table detection and released
+        before the next one is parsed, so peak memory is bounded by the largest page.
+        
+        Args:
+            page_numbers: Optional iterable of zero-based page indexes to process
+        
+        Yields:
+            (table_name, DataFrame) pairs in the same order as extract_tables_from_layout;
+            with stitch_tables, a table is yielded once the page after its last one is parsed
+        """
+        try:
+            stitcher = TableStitcher() if self.stitch_tables else None
+            for layout in self.iter_layout_pages(page_numbers):
+                yield from self.typed_tables(self.collect_page_tables(layout, stitcher))
+            if stitcher is not None:
+                yield from self.typed_tables(stitcher.finish())
+            self.learn_template()
+        except Exception as e:
+            raise Exception(f"Error streaming tables: {str(e)}")
+    
+    def get_pdf_data(self):
+        """
+        Return the PDF contents as a single buffer shared by every parser
+        
+        The buffer is obtained once and cached: files on disk and real file objects
+        are memory-mapped (unless use_mmap is False), BytesIO-style objects (including
+        Streamlit uploads) hand over their internal bytes without a copy, and anything
+        else is read once.
+        """
+        if self.pdf_data is not None:
+            return self.pdf_data
+        
+        if self.file_path:
+            with open(self.file_path, 'rb') as file:
+                if self.use_mmap and self.map_file(file):
+                    return self.pdf_data
+                self.pdf_data = file.read()
+                return self.pdf_data
+        
+        if not self.file_object:
+            raise ValueError("No file path or file object provided")
+        
+        getvalue = getattr(self.file_object, 'getvalue', None)
+        if getvalue is not None:
+            self.pdf_data = getvalue()
+            return self.pdf_data
+        
+        if self.use_mmap and self.map_file(self.file_object):
+            return self.pdf_data
+        
+        # Save current position
+        position = self.file_object.tell()
+        # Reset to beginning
+        self.file_object.seek(0)
+        
+        self.pdf_data = self.file_object.read()
+        
+        # Reset file position to what it was
+        self.file_object.seek(position)
+        return self.pdf_data
+    
+    def map_file(self, file):
+        """
+        Memory-map an open file as the shared PDF buffer
+        
+        The mapping stays valid after the file is closed. Pages of the mapping are
+        only read from disk when a parser touches them.
+        
+        Returns:
+            True if the file was mapped, False if it has no usable descriptor or is empty
+        """
+        try:
+            fileno = file.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return False
+        
+        if os.fstat(fileno).st_size == 0:
+            return False
+        
+        self._mmap = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        self.pdf_data = memoryview(self._mmap)
+        return True
+    
+    def open_pdf_stream(self):
+        """
+        Open a new, independently positioned file object over the PDF
+        
+        In-memory and memory-mapped sources share one buffer; with use_mmap=False a
+        file_path is opened with regular buffered I/O.
+        """
+        if self.file_path and not self.use_mmap and self.pdf_data is None:
+            return open(self.file_path, 'rb')
+        
+        data = self.get_pdf_data()
+        
+        # BytesIO shares a bytes object until it is written to, so this doesn't copy
+        if isinstance(data, bytes):
+            return io.BytesIO(data)
+        reader = BufferReader(data)
+        if self._mmap is not None:
+            self._buffer_readers.add(reader)
+        return reader
+    
+    def close(self):
+        """
+        Release the memory map, if the PDF was mapped from a file
+        
+        Readers from open_pdf_stream are closed first. If views of the mapping are
+        still held elsewhere, such as the buffer returned by get_pdf_data, the map
+        is unmapped when the last of them is garbage collected instead.
+        """
+        if self._mmap is None:
+            return
+        
+        for reader in list(self._buffer_readers):
+            reader.close()
+        try:
+            self.pdf_data.release()
+            self._mmap.close()
+        except BufferError:
+            pass
+        self._mmap = None
+        self.pdf_data = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def get_page_count(self):
+        """
+        Count the pages in the PDF without running layout analysis
+        """
+        with self.open_pdf_stream() as stream:
+            document = PDFDocument(PDFParser(stream))
+            return sum(1 for _ in PDFPage.create_pages(document))
+    
+    def extract_tables_parallel(self, max_workers=None, page_numbers=None):
+        """
+        Extract layout tables with pages split across a process pool
+        
+        Each worker runs layout analysis and table detection for a contiguous page
+        range. Results are merged in page order, so the output matches
+        extract_tables_from_layout regardless of worker count or scheduling. The
+        workers' page layouts are kept in layout_elements, and a pass over the
+        whole document is stored in the layout cache; a cached layout is used
+        instead of starting workers.
+        
+        Args:
+            max_workers: Number of worker processes (defaults to the CPU count)
+            page_numbers: Optional iterable of zero-based page indexes to process
+            
+        Returns:
+            Dictionary with table names as keys and DataFrames as values
+        """
+        tables = self.detect_layout_tables_parallel(page_numbers, max_workers)
+        return convert_table_types(tables) if self.infer_types else tables
+    
+    def detect_layout_tables_parallel(self, page_numbers=None, max_workers=None, progress_callback=None):
+        """
+        Layout table detection for extract_tables_parallel, before type inference
+        
+        progress_callback is invoked as described in extract_tables, as each
+        worker's page range is merged.
+        """
+        try:
+            page_count = self.get_page_count()
+            selected_pages = sorted(set(page_numbers) & set(range(page_count)) if page_numbers is not None
+                                    else range(page_count))
+            max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(selected_pages)))
+            
+            # Not worth spawning processes for a single page range or a cached layout
+            cache_key = None
+            if self.layout_cache is not None:
+                cache_key = self.layout_cache_key()
+            if max_workers == 1 or (cache_key is not None and cache_key in self.layout_cache):
+                return self.stream_layout_tables(page_numbers, progress_callback=progress_callback)
+            
+            # The template comes from page 0, which only one worker would see
+            if self.template_index is not None and selected_pages[0] == 0 and self._template_key is None:
+                first_page = next(self.iter_layout_pages([0]))
+                self._template_key = TemplateIndex.fingerprint(first_page)
+                self._template = self.template_index.get(self._template_key)
+            
+            # Split pages into contiguous, evenly sized ranges
+            chunk_size = -(-len(selected_pages) // max_workers)
+            page_ranges = [selected_pages[start:start + chunk_size]
+                           for start in range(0, len(selected_pages), chunk_size)]
+            
+            # Workers re-open the file by path; in-memory uploads are sent as bytes
+            pdf_bytes = None if self.file_path else bytes(self.get_pdf_data())
+            
+            tables = {}
+            stitcher = TableStitcher() if self.stitch_tables else None
+            self.layout_elements = []
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_extract_page_range_tables, self.file_path, pdf_bytes, page_range,
+                                           self.layout_profile, self._template_key, self._template)
+                           for page_range in page_ranges]
+                # Collect in submission order to keep the output deterministic
+                for future in futures:
+                    pages, plan, cells = future.result()
+                    for layout, fragments in pages:
+                        self.layout_elements.append(layout)
+                        if stitcher is None:
+                            page_tables = [(fragment.name, fragment.to_frame()) for fragment in fragments]
+                        else:
+                            page_tables = stitcher.add_page(layout.page_num, fragments)
+                        tables.update(page_tables)
+                        if progress_callback:
+                            progress_callback(layout, page_tables)
+                    
+                    # Keep the plan of the document's largest table, as a single pass would
+                    if plan is not None and cells > self._template_cells:
+                        self._template_plan = plan
+                        self._template_cells = cells
+            
+            if stitcher is not None:
+                tables.update(stitcher.finish())
+            self.learn_template()
+            # Only a complete pass over the whole document is stored, as in iter_layout_pages
+            if cache_key is not None and page_numbers is None:
+                self.layout_cache.put(cache_key, PageLayout.pack(self.layout_elements))
+            return tables
+        except Exception as e:
+            raise Exception(f"Error extracting tables in parallel: {str(e)}")
+    
+    def detect_table_type(self, page_numbers=None):
         """
         Detect the type of tables in the PDF
+        
+        Args:
+            page_numbers: Optional iterable of zero-based page indexes to read the
+                text from, if it hasn't been extracted yet
         """
         if not self.pdf_text:
-            self.extract_text()
+            self.extract_text(page_numbers=page_numbers)
             
-        if "BANK NAME" in self.pdf_text or "Statement of account" in self.pdf_text:
-            return "bank_statement"
-        elif re.search(r'\$\d+\s+\$\s+\$\d+\s+\$', self.pdf_text):
-            return "code_based"
-        else:
-            return "general"
+        return classify_document_text(self.pdf_text)
+    
+    def get_plan_features(self):
+        """
+        Cheap document features for StrategyPlanner, read with PyPDF2 from page 1 only
+        
+        Returns:
+            Dictionary with shapes (rectangles and line segments drawn on page 1),
+            table_type (detect_table_type on page 1's text) and labels (page 1's
+            header labels, see template_index.header_labels)
+        """
+        if self._plan_features is None:
+            features = {"shapes": 0, "table_type": "general", "labels": []}
+            try:
+                with self.open_pdf_stream() as stream:
+                    reader = PdfReader(stream)
+                    if reader.pages:
+                        page = reader.pages[0]
+                        contents = page.get_contents()
+                        if contents is not None:
+                            features["shapes"] = len(PATTERNS["shape_operator"].findall(contents.get_data()))
+                        text = page.extract_text()
+                        features["table_type"] = classify_document_text(text)
+                        features["labels"] = header_labels([line.strip() for line in text.split('\n')
+                                                            if line.strip()])
+            except Exception:
+                # Features only steer the plan; unreadable ones fall back to the default order
+                pass
+            self._plan_features = features
+        
+        return self._plan_features
     
-    def extract_tables(self):
+    def extract_tables(self, pages=None, max_tables=None, stop_after_first_match=False, progress_callback=None):
         """
         Extract tables from PDF based on detected type, with enhanced layout analysis
+        
+        Args:
+            pages: Optional iterable of zero-based page indexes; other pages are never parsed
+            max_tables: Stop once this many tables have been found
+            stop_after_first_match: Stop after the first page (or text strategy) that yields tables
+            progress_callback: Optional callable invoked by layout detection with each
+                page's PageLayout and the list of (table_name, DataFrame) pairs found
+                on it (with stitching, the tables that ended before it), before
+                type inference
         """
-        if not self.pdf_text:
-            self.extract_text()
-            
-        # Extract layout elements if not done already
-        if not self.layout_elements:
-            self.extract_layout_elements()
-            
-        table_type = self.detect_table_type()
+        tables = self.run_strategies(pages, max_tables, stop_after_first_match, progress_callback)
+        return convert_table_types(tables) if self.infer_types else tables
+    
+    def typed_tables(self, tables):
+        """
+        Pass (table_name, DataFrame) pairs through infer_table_types if infer_types is set
+        """
+        if not self.infer_types:
+            return tables
+        return [(table_name, infer_table_types(df)) for table_name, df in tables]
+    
+    def run_strategies(self, pages=None, max_tables=None, stop_after_first_match=False, progress_callback=None):
+        """
+        Run the extraction strategies for extract_tables, returning their tables as strings
+        """
+        # A strategy picked by name runs on its own, with no fallbacks
+        if self.strategy != "auto":
+            if STRATEGIES[self.strategy].needs_layout:
+                return self.limit_tables(self.detect_layout_tables(pages, progress_callback=progress_callback),
+                                         max_tables)
+            return self.limit_tables(STRATEGIES[self.strategy].run(self, pages), max_tables)
+        
+        if self.planner is not None:
+            return self.extract_tables_planned(pages, max_tables, stop_after_first_match, progress_callback)
         
-        # Try layout-based extraction first
-        layout_tables = self.extract_tables_from_layout()
+        layout_tables = self.detect_layout_tables(pages, max_tables, stop_after_first_match, progress_callback)
         
         # If layout extraction found tables, return those
         if layout_tables:
-            return layout_tables
+            return self.limit_tables(layout_tables, max_tables)
+        
+        # In layout mode this reuses the page layouts parsed above
+        if not self.pdf_text:
+            self.extract_text(page_numbers=pages)
         
-        # Otherwise, fall back to text-based methods
-        if table_type == "bank_statement":
-            tables = self.extract_bank_statement_tables()
-            account_info = self.extract_vertical_tables()
-            tables.update(account_info)
+        # Selected pages without text leave nothing for the text strategies
+        if not self.pdf_text.strip():
+            return {}
+            
+        table_type = self.detect_table_type(pages)
+        
+        # Otherwise, fall back to the text strategies registered for this document type,
+        # cheapest first, until one finds tables
+        tables = {}
+        for strategy in get_strategies(table_type, needs_layout=False, supplement=False):
+            tables = strategy.run(self, pages)
+            if tables:
+                break
+        
+        # Then merge in supplementary tables, such as account details next to transactions
+        if not (stop_after_first_match and tables):
+            for strategy in get_strategies(table_type, needs_layout=False, supplement=True):
+                tables.update(strategy.run(self, pages))
+        
+        return self.limit_tables(tables, max_tables)
+    
+    def extract_tables_planned(self, pages=None, max_tables=None, stop_after_first_match=False,
+                               progress_callback=None):
+        """
+        Extract tables trying strategies in the order planned by self.planner
+        
+        The first strategy that finds tables wins and is recorded for the document's
+        template. If every planned strategy comes up empty, the remaining text
+        strategies for the type detected on the full text are tried, as in
+        extract_tables.
+        """
+        features = self.get_plan_features()
+        table_type = features["table_type"]
+        plan = self.planner.plan(features, get_strategies(table_type, supplement=False))
+        
+        tables = {}
+        winner = None
+        for strategy in plan:
+            if strategy.needs_layout:
+                tables = self.detect_layout_tables(pages, max_tables, stop_after_first_match, progress_callback)
+            else:
+                tables = strategy.run(self, pages)
+            if tables:
+                winner = strategy
+                break
+        
+        # Page 1 can be misleading, e.g. when the statement header comes later
+        if winner is None:
+            tried = {strategy.name for strategy in plan}
+            table_type = self.detect_table_type(pages)
+            if not self.pdf_text.strip():
+                return {}
+            for strategy in get_strategies(table_type, needs_layout=False, supplement=False):
+                if strategy.name in tried:
+                    continue
+                tables = strategy.run(self, pages)
+                if tables:
+                    winner = strategy
+                    break
+        
+        if winner is not None:
+            self.planner.record(features, winner.name)
+        
+        # Supplementary tables accompany the text strategies, as in extract_tables
+        if (winner is None or not winner.needs_layout) and not (stop_after_first_match and tables):
+            for strategy in get_strategies(table_type, needs_layout=False, supplement=True):
+                tables.update(strategy.run(self, pages))
+        
+        return self.limit_tables(tables, max_tables)
+    
+    def detect_layout_tables(self, pages=None, max_tables=None, stop_after_first_match=False,
+                             progress_callback=None):
+        """
+        Run layout detection, parsing the layout first if that hasn't been done yet
+        
+        Tables are detected as each page is parsed, so the pass can stop as soon as
+        the early-exit options are met. progress_callback is invoked as described
+        in extract_tables.
+        """
+        if self.layout_elements:
+            return self.extract_tables_from_layout(pages)
+        
+        # Early exits need the pages in order, so they stay in this process
+        if self.page_workers > 1 and max_tables is None and not stop_after_first_match:
+            return self.detect_layout_tables_parallel(pages, self.page_workers, progress_callback)
+        
+        return self.stream_layout_tables(pages, max_tables, stop_after_first_match, progress_callback)
+    
+    def stream_layout_tables(self, pages=None, max_tables=None, stop_after_first_match=False,
+                             progress_callback=None):
+        """
+        Parse the layout in this process, detecting each page's tables as it comes out
+        """
+        layout_tables = {}
+        stitcher = TableStitcher() if self.stitch_tables else None
+        
+        # When stitching, only tables that have ended count, so the pass never stops
+        # in the middle of a table continuing onto the next page
+        def collect_page_tables(layout):
+            page_tables = self.collect_page_tables(layout, stitcher)
+            layout_tables.update(page_tables)
+            if progress_callback:
+                progress_callback(layout, page_tables)
+            return ((max_tables is not None and len(layout_tables) >= max_tables) or
+                    (stop_after_first_match and bool(page_tables)))
+        
+        self.extract_layout_elements(progress_callback=collect_page_tables, page_numbers=pages)
+        if stitcher is not None:
+            layout_tables.update(stitcher.finish())
+        self.learn_template()
+        return layout_tables
+    
+    def collect_page_tables(self, layout, stitcher=None):
+        """
+        Detect a page's tables, passing them through a TableStitcher if one is given
+        
+        Returns:
+            List of (table_name, DataFrame) pairs: the page's tables, or with a
+            stitcher the tables that ended before this page
+        """
+        if stitcher is None:
+            return list(self.detect_page_tables(layout).items())
+        return stitcher.add_page(layout.page_num, self.page_table_fragments(layout))
+    
+    @staticmethod
+    def limit_tables(tables, max_tables):
+        """
+        Keep only the first max_tables tables, preserving order
+        """
+        if max_tables is None or len(tables) <= max_tables:
             return tables
-        elif table_type == "code_based":
-            return self.extract_code_based_tables()
-        else:
-            general_tables = self.extract_general_tables()
-            if not general_tables:
-                general_tables = self.extract_line_based_tables()
-            return general_tables
+        return dict(list(tables.items())[:max_tables])
     
-    def extract_tables_from_layout(self):
+    @register_strategy("layout", cost=100, needs_layout=True,
+                       description="Layout analysis (bordered and borderless tables)")
+    def extract_tables_from_layout(self, page_numbers=None):
         """
         Extract tables by analyzing the layout elements (text boxes and lines)
+        
+        Args:
+            page_numbers: Optional iterable of zero-based page indexes to restrict detection to
         """
+        # Parse the layout once if it hasn't been done yet
+        if not self.layout_elements:
+            self.extract_layout_elements(page_numbers=page_numbers)
+        
         tables = {}
-        table_count = 0
+        selected_pages = set(page_numbers) if page_numbers is not None else None
+        stitcher = TableStitcher() if self.stitch_tables else None
         
         # Process each page
-        for page_num, (text_boxes, lines, rects) in enumerate(zip(self.text_boxes, self.lines, self.rects)):
-            # Skip pages without enough elements
-            if len(text_boxes) < 3:
+        for layout in self.layout_elements:
+            if selected_pages is not None and layout.page_num not in selected_pages:
                 continue
-                
-            # First, detect tables based on rectangles (bordered tables)
-            bordered_tables = self.detect_bordered_tables(text_boxes, rects, page_num)
-            tables.update(bordered_tables)
-            table_count += len(bordered_tables)
             
-            # Next, detect tables based on aligned text boxes (borderless tables)
-            if not bordered_tables:
-                borderless_tables = self.detect_borderless_tables(text_boxes, page_num)
-                tables.update(borderless_tables)
-                table_count += len(borderless_tables)
+            tables.update(self.collect_page_tables(layout, stitcher))
         
+        if stitcher is not None:
+            tables.update(stitcher.finish())
+        self.learn_template()
         return tables
     
-    def detect_bordered_tables(self, text_boxes, rects, page_num):
+    def detect_page_tables(self, layout):
+        """
+        Detect bordered tables on a single page, falling back to borderless detection
+        
+        Args:
+            layout: PageLayout of the page
+        """
+        return {fragment.name: fragment.to_frame() for fragment in self.page_table_fragments(layout)}
+    
+    def page_table_fragments(self, layout):
+        """
+        Detect a page's tables as in detect_page_tables, as TableFragments
+        """
+        # Look the document's template up once, from its first page
+        if self.template_index is not None and layout.page_num == 0 and self._template_key is None:
+            self._template_key = TemplateIndex.fingerprint(layout)
+            self._template = self.template_index.get(self._template_key)
+        
+        # Skip pages without enough elements
+        if len(layout.texts) < 3:
+            return []
+            
+        # First, detect tables based on rectangles (bordered tables)
+        bordered_tables = self.bordered_table_fragments(layout)
+        if bordered_tables:
+            return bordered_tables
+        
+        # Known templates are sliced by their learned columns; pages where that finds
+        # nothing, such as a summary page, still get the heuristics
+        if self._template is not None:
+            template_tables = self.template_table_fragments(layout, self._template)
+            if template_tables:
+                return template_tables
+        
+        # Next, detect tables based on aligned text boxes (borderless tables)
+        borderless_tables = self.borderless_table_fragments(layout)
+        
+        # The first document of a new template teaches the index the columns of its
+        # largest table, such as the transactions rather than the account summary
+        if borderless_tables and self._template_key is not None and self._template is None:
+            plan = self.learn_template_plan(layout)
+            if plan is not None and plan["sample_rows"] * (len(plan["columns"]) + 1) > self._template_cells:
+                self._template_plan = plan
+                self._template_cells = plan["sample_rows"] * (len(plan["columns"]) + 1)
+        
+        return borderless_tables
+    
+    def learn_template(self):
+        """
+        Store the plan of the document's largest borderless table in the template index
+        
+        Called at the end of every layout pass, so the index is written once per
+        document rather than once per page; callers of detect_page_tables call it
+        after their last page.
+        """
+        if self._template_plan is not None:
+            self.template_index.put(self._template_key, self._template_plan)
+            self._template_plan = None
+    
+    def detect_bordered_tables(self, layout):
         """
         Detect tables that have borders (rectangles) around them
         """
-        tables = {}
+        return {fragment.name: fragment.to_frame() for fragment in self.bordered_table_fragments(layout)}
+    
+    def bordered_table_fragments(self, layout):
+        """
+        Detect bordered tables as in detect_bordered_tables, as TableFragments
+        """
+        tables = []
+        rects = layout.rects
         
         # Skip if no rectangles
-        if not rects:
+        if not len(rects):
             return tables
             
         # Find potential table rectangles (larger rectangles that might contain tables)
-        potential_table_rects = [rect for rect in rects if rect.height > 50 and rect.width > 100]
+        heights = rects[:, Y1] - rects[:, Y0]
+        widths = rects[:, X1] - rects[:, X0]
+        potential_table_rects = rects[(heights > 50) & (widths > 100)]
+        if not len(potential_table_rects):
+            return tables
+        
+        # Index the page's text boxes once so each rectangle only visits nearby boxes
+        box_index = TextBoxGridIndex(layout.boxes)
         
-        for i, table_rect in enumerate(potential_table_rects):
+        for i, table_rect in enumerate(potential_table_rects.tolist()):
             # Find all text boxes within this rectangle
-            contained_text_boxes = []
-            for box in text_boxes:
-                if (box.x0 >= table_rect.x0 and box.x1 <= table_rect.x1 and
-                    box.y0 >= table_rect.y0 and box.y1 <= table_rect.y1):
-                    contained_text_boxes.append(box)
+            contained = box_index.contained_in(table_rect)
             
             # Skip if not enough text boxes
-            if len(contained_text_boxes) < 3:
+            if len(contained) < 3:
                 continue
                 
             # Sort text boxes from top to bottom
-            contained_text_boxes.sort(key=lambda box: -box.y1)  # Negative because PDF coordinates are bottom-up
+            contained = contained[np.argsort(-layout.boxes[contained, Y1], kind="stable")]  # Negative because PDF coordinates are bottom-up
             
             # Convert to rows and columns
-            table_data = self.convert_text_boxes_to_table(contained_text_boxes)
-            
-            if table_data:
-                table_name = f"Bordered_Table_Page{page_num+1}_{i+1}"
-                tables[table_name] = pd.DataFrame(table_data)
+            rows = self.text_box_rows(layout, contained)
+            tables.append(self.packed_table_fragment(layout, f"Bordered_Table_Page{layout.page_num+1}_{i+1}", rows))
         
         return tables
     
-    def detect_borderless_tables(self, text_boxes, page_num):
+    def detect_borderless_tables(self, layout):
         """
         Detect tables without borders by analyzing alignment of text boxes
         """
-        tables = {}
+        return {fragment.name: fragment.to_frame() for fragment in self.borderless_table_fragments(layout)}
+    
+    def borderless_table_fragments(self, layout):
+        """
+        Detect borderless tables as in detect_borderless_tables, as TableFragments
+        """
+        tables = []
         
         # Skip if not enough text boxes
-        if len(text_boxes) < 5:
+        if len(layout.texts) < 5:
             return tables
-            
-        # Sort text boxes from top to bottom
-        text_boxes.sort(key=lambda box: -box.y1)  # Negative because PDF coordinates are bottom-up
         
-        # Group text boxes by similar y-positions (potential rows)
-        row_groups = self.group_by_position(text_boxes, 'y', threshold=10)
+        ordered, row_starts, row_ends, runs = self.find_borderless_row_runs(layout)
+        
+        for start, stop in runs:
+            # Rows start through stop-1 of the table; cells are already ordered left to right
+            rows = [ordered[row_start:row_end] for row_start, row_end in zip(row_starts[start:stop], row_ends[start:stop])]
+            table_name = f"Borderless_Table_Page{layout.page_num+1}_{len(tables)+1}"
+            tables.append(self.packed_table_fragment(layout, table_name, rows))
+        
+        return tables
+    
+    def packed_table_fragment(self, layout, table_name, rows):
+        """
+        Build a TableFragment from rows of box indexes ordered left to right
+        
+        Each row's texts fill its leftmost cells and short rows are padded with
+        empty strings. Column starts are the median left edges over the rows that
+        fill every column.
+        """
+        # Normalize the table (make sure all rows have the same number of columns)
+        max_cols = max(len(row) for row in rows)
+        table_data = [[layout.texts[index].strip() for index in row.tolist()] + [''] * (max_cols - len(row))
+                      for row in rows]
+        
+        full_rows = np.array([row for row in rows if len(row) == max_cols])
+        edges = np.median(layout.boxes[full_rows, X0].astype(np.float64), axis=0)
+        return TableFragment(table_name, layout.page_num, np.array(table_data, dtype=object), edges)
+    
+    def find_borderless_row_runs(self, layout, threshold=10):
+        """
+        Find runs of at least 3 consecutive rows with a similar number of text boxes
+        
+        Rows holding a single text box are ignored, so they neither belong to nor
+        interrupt a run.
+        
+        Returns:
+            (ordered, row_starts, row_ends, runs): box indexes row by row, the start
+            and end offsets in ordered of each multi-box row, and (start, stop)
+            ranges over those rows, one per table
+        """
+        # Rows of text boxes, sorted once per page and shared by every detection run
+        ordered, row_starts = self.build_row_index(layout, threshold)
+        row_ends = np.append(row_starts[1:], len(ordered))
+        
+        # Filter rows: keep only those with multiple text boxes (potential table rows)
+        multiple = row_ends - row_starts >= 2
+        row_starts = row_starts[multiple].tolist()
+        row_ends = row_ends[multiple].tolist()
+        row_lens = [end - start for start, end in zip(row_starts, row_ends)]
         
-        # Filter groups: keep only those with multiple text boxes (potential table rows)
-        potential_rows = [group for group in row_groups if len(group) >= 2]
+        runs = []
         
         # Skip if not enough potential rows
-        if len(potential_rows) < 3:
-            return tables
+        if len(row_lens) < 3:
+            return ordered, row_starts, row_ends, runs
+        
+        # Whether each run of 3 consecutive rows has a similar number of text boxes
+        windows = np.lib.stride_tricks.sliding_window_view(row_lens, 3)
+        similar_windows = (windows.max(axis=1) - windows.min(axis=1) <= 1).tolist()
             
         # For each group of potential rows, try to detect a table
         i = 0
-        while i < len(potential_rows) - 2:  # Need at least 3 rows
-            # Check if this and the next few rows have similar number of text boxes
-            row_lens = [len(potential_rows[i+j]) for j in range(3)]  # Check 3 consecutive rows
-            
+        while i < len(row_lens) - 2:  # Need at least 3 rows
             # If the rows have similar number of elements, they might form a table
-            if max(row_lens) - min(row_lens) <= 1 and min(row_lens) >= 2:
+            if similar_windows[i]:
                 # Find how many consecutive rows match this pattern
                 j = 3
-                while i + j < len(potential_rows):
-                    if abs(len(potential_rows[i+j]) - len(potential_rows[i])) <= 1:
-                        j += 1
-                    else:
-                        break
-                
-                # Extract this table (rows i through i+j-1)
-                table_rows = potential_rows[i:i+j]
+                while i + j < len(row_lens) and abs(row_lens[i+j] - row_lens[i]) <= 1:
+                    j += 1
                 
-                # Convert to a structured table
-                table_data = []
-                for row in table_rows:
-                    # Sort cells from left to right
-                    row.sort(key=lambda box: box.x0)
-                    # Extract text from each cell
-                    table_data.append([box.get_text().strip() for box in row])
-                
-                # Normalize the table (make sure all rows have the same number of columns)
-                max_cols = max(len(row) for row in table_data)
-                table_data = [row + [''] * (max_cols - len(row)) for row in table_data]
-                
-                # Create a DataFrame
-                table_name = f"Borderless_Table_Page{page_num+1}_{len(tables)+1}"
-                tables[table_name] = pd.DataFrame(table_data)
+                runs.append((i, i + j))
                 
                 # Move past this table
                 i += j
             else:
                 i += 1
         
+        return ordered, row_starts, row_ends, runs
+    
+    def learn_template_plan(self, layout, threshold=10, column_gap=10):
+        """
+        Derive a template plan from the largest borderless table on a page
+        
+        The left edges of all the table's text boxes are clustered: a gap wider than
+        column_gap between neighbouring edges separates two columns, and the
+        boundary goes in the middle of the gap. Columns that are never filled in the
+        same row, such as debit and credit, are still told apart, and lines stacked
+        within one row share a column.
+        
+        Returns:
+            Dictionary for TemplateIndex.put, or None if the table has a single column
+        """
+        ordered, row_starts, row_ends, runs = self.find_borderless_row_runs(layout, threshold)
+        if not runs:
+            return None
+        start, stop = max(runs, key=lambda run: run[1] - run[0])
+        
+        indexes = np.concatenate([ordered[row_start:row_end] for row_start, row_end
+                                  in zip(row_starts[start:stop], row_ends[start:stop])])
+        left_edges = np.sort(layout.boxes[indexes, X0].astype(np.float64))
+        gaps = np.flatnonzero(np.diff(left_edges) > column_gap)
+        if not len(gaps):
+            return None
+        
+        columns = (left_edges[gaps] + left_edges[gaps + 1]) / 2
+        return {"columns": columns.tolist(), "row_threshold": threshold, "sample_rows": stop - start}
+    
+    def slice_template_tables(self, layout, plan):
+        """
+        Cut a page's rows into cells at a template's learned column boundaries
+        
+        Rows whose number of text boxes is within one of the number of columns, in
+        runs of at least 3, become tables; rows holding a single text box are
+        skipped, as in detect_borderless_tables. Text boxes falling into the same
+        column are joined with a space, and empty columns stay empty.
+        """
+        return {fragment.name: fragment.to_frame() for fragment in self.template_table_fragments(layout, plan)}
+    
+    def template_table_fragments(self, layout, plan):
+        """
+        Slice a page's tables as in slice_template_tables, as TableFragments
+        """
+        tables = []
+        columns = np.asarray(plan["columns"])
+        num_cols = len(columns) + 1
+        
+        ordered, row_starts = self.build_row_index(layout, plan["row_threshold"])
+        row_lens = np.diff(np.append(row_starts, len(ordered)))
+        
+        # Runs of table rows over the multi-box rows
+        multiple = np.flatnonzero(row_lens >= 2)
+        in_table = np.abs(row_lens[multiple] - num_cols) <= 1
+        edges = np.diff(np.concatenate(([0], in_table.astype(np.int8), [0])))
+        run_starts = np.flatnonzero(edges == 1)
+        run_stops = np.flatnonzero(edges == -1)
+        if not np.any(run_stops - run_starts >= 3):
+            return tables
+        
+        # Column of every text box, from its left edge; long cells overflow to the right
+        column_ids = np.searchsorted(columns, layout.boxes[:, X0])
+        texts = np.array([text.strip() for text in layout.texts], dtype=object)
+        row_ids = np.repeat(np.arange(len(row_starts)), row_lens)
+        
+        for start, stop in zip(run_starts.tolist(), run_stops.tolist()):
+            if stop - start < 3:
+                continue
+            
+            # Number each of the run's rows within the table, and find their boxes
+            table_rows = np.full(len(row_starts), -1)
+            table_rows[multiple[start:stop]] = np.arange(stop - start)
+            positions = np.flatnonzero(table_rows[row_ids] >= 0)
+            boxes = ordered[positions]
+            
+            # Rows are ordered top to bottom and boxes left to right, so boxes sharing
+            # a cell are adjacent; only those cells need joining
+            cell_ids = table_rows[row_ids[positions]] * num_cols + column_ids[boxes]
+            cells = np.full((stop - start) * num_cols, "", dtype=object)
+            cells[cell_ids] = texts[boxes]
+            group_starts = np.flatnonzero(np.diff(cell_ids, prepend=-1))
+            group_ends = np.append(group_starts[1:], len(cell_ids))
+            for group_start, group_end in zip(group_starts[group_ends - group_starts > 1].tolist(),
+                                              group_ends[group_ends - group_starts > 1].tolist()):
+                cells[cell_ids[group_start]] = " ".join(texts[boxes[group_start:group_end]])
+            
+            # Where each column starts on this page (the mean left edge of its boxes,
+            # which stays within the column's boundaries), for matching continuation pages
+            box_columns = column_ids[boxes]
+            counts = np.bincount(box_columns, minlength=num_cols)
+            sums = np.bincount(box_columns, weights=layout.boxes[boxes, X0], minlength=num_cols)
+            edges = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+            
+            table_name = f"Borderless_Table_Page{layout.page_num+1}_{len(tables)+1}"
+            tables.append(TableFragment(table_name, layout.page_num, cells.reshape(stop - start, num_cols), edges))
+        
         return tables
     
-    def group_by_position(self, elements, axis, threshold=10):
+    def build_row_index(self, layout, threshold=10):
+        """
+        Sort a page's text boxes once into rows, top to bottom and left to right
+        
+        The result is cached on the layout and never mutated, so repeated or
+        concurrent detection on the same page reuses it.
+        
+        Returns:
+            (ordered, row_starts): box indexes row by row, and the offset of each row in ordered
+        """
+        row_index = layout.row_indexes.get(threshold)
+        if row_index is not None:
+            return row_index
+        
+        boxes = layout.boxes
+        
+        # Top to bottom by y0, as group_by_position groups rows, with ties ordered by y1
+        by_y = np.lexsort((-boxes[:, Y1], -boxes[:, Y0]))  # Negative because PDF coordinates are bottom-up
+        row_starts = self.group_starts(-boxes[by_y, Y0].astype(np.float64), threshold)
+        
+        # Left to right within each row; lexsort is stable, so ties keep the row's order
+        row_ids = np.repeat(np.arange(len(row_starts)), np.diff(np.append(row_starts, len(by_y))))
+        ordered = by_y[np.lexsort((boxes[by_y, X0], row_ids))]
+        
+        row_index = (ordered, row_starts)
+        layout.row_indexes[threshold] = row_index
+        return row_index
+    
+    def group_by_position(self, boxes, indexes, axis, threshold=10):
         """
-        Group elements that have similar positions along an axis
+        Group boxes that have similar positions along an axis
         
         Args:
-            elements: List of layout elements
+            boxes: (n, 4) array of x0, y0, x1, y1
+            indexes: Array of the rows of boxes to group; ties keep this order
             axis: 'x' for horizontal or 'y' for vertical grouping
             threshold: Maximum difference in position to be considered the same group
             
         Returns:
-            List of groups, where each group is a list of elements
+            List of groups, where each group is an array of box indexes
         """
-        if not elements:
+        if not len(indexes):
             return []
             
-        # Sort elements by the chosen axis
+        # Sort boxes by the chosen axis. Keys are float64 so that adding or subtracting
+        # the threshold is exact for the float32 coordinates
         if axis == 'x':
-            sorted_elements = sorted(elements, key=lambda e: e.x0)
+            keys = boxes[indexes, X0].astype(np.float64)
         else:  # axis == 'y'
-            sorted_elements = sorted(elements, key=lambda e: -e.y0)  # Negative for top-to-bottom sorting
+            keys = -boxes[indexes, Y0].astype(np.float64)  # Negative for top-to-bottom sorting
+        order = np.argsort(keys, kind="stable")
         
-        groups = []
-        current_group = [sorted_elements[0]]
-        current_pos = getattr(sorted_elements[0], f"{axis}0")
+        return np.split(indexes[order], self.group_starts(keys[order], threshold)[1:])
+    
+    @staticmethod
+    def group_starts(sorted_keys, threshold):
+        """
+        Offsets where groups start in ascending float64 keys
         
-        for element in sorted_elements[1:]:
-            element_pos = getattr(element, f"{axis}0")
-            
-            if abs(element_pos - current_pos) <= threshold:
-                # Element belongs to the current group
-                current_group.append(element)
-            else:
-                # Start a new group
-                groups.append(current_group)
-                current_group = [element]
-                current_pos = element_pos
+        Each group is anchored at its first key and holds the following keys within
+        threshold of it.
+        """
+        if not len(sorted_keys):
+            return np.empty(0, dtype=np.intp)
+        
+        # A gap wider than the threshold between neighbours always starts a new group
+        group_starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_keys) > threshold) + 1))
+        segment_ends = np.append(group_starts[1:], len(sorted_keys))
         
-        # Don't forget the last group
-        if current_group:
-            groups.append(current_group)
+        # A group is anchored at its first key, so a run of small gaps spanning more
+        # than the threshold has to be split further; find those breaks by binary search
+        wide = np.flatnonzero(sorted_keys[segment_ends - 1] - sorted_keys[group_starts] > threshold)
+        if len(wide):
+            key_list = sorted_keys.tolist()
+            extra_starts = []
+            for segment_start, segment_end in zip(group_starts[wide].tolist(), segment_ends[wide].tolist()):
+                group_start = segment_start
+                while True:
+                    group_start = bisect.bisect_right(key_list, key_list[group_start] + threshold,
+                                                      group_start, segment_end)
+                    if group_start >= segment_end:
+                        break
+                    extra_starts.append(group_start)
+            group_starts = np.sort(np.concatenate((group_starts, extra_starts))).astype(np.intp)
         
-        return groups
+        return group_starts
+    
+    def text_box_rows(self, layout, indexes):
+        """
+        Group text boxes, given as indexes into the page layout, into rows of
+        indexes ordered left to right
+        """
+        return [row[np.argsort(layout.boxes[row, X0], kind="stable")]
+                for row in self.group_by_position(layout.boxes, indexes, 'y')]
+    
+    def row_texts(self, layout, row):
+        """
+        Texts of a row of text boxes, sorted from left to right
+        """
+        row = row[np.argsort(layout.boxes[row, X0], kind="stable")]
+        return [layout.texts[index].strip() for index in row.tolist()]
     
-    def convert_text_boxes_to_table(self, text_boxes):
+    def convert_text_boxes_to_table(self, layout, indexes):
         """
-        Convert a list of text boxes to a structured table
+        Convert text boxes, given as indexes into the page layout, to a structured table
         """
-        if not text_boxes:
+        if not len(indexes):
             return []
             
         # Group text boxes by similar y-positions (rows)
-        row_groups = self.group_by_position(text_boxes, 'y')
+        row_groups = self.group_by_position(layout.boxes, indexes, 'y')
         
         # Convert each row group to a list of text values
-        table_data = []
-        for row in row_groups:
-            # Sort cells from left to right
-            row.sort(key=lambda box: box.x0)
-            # Extract text from each cell
-            table_data.append([box.get_text().strip() for box in row])
+        table_data = [self.row_texts(layout, row) for row in row_groups]
         
         # Normalize the table (make sure all rows have the same number of columns)
         if table_data:
@@ -353,70 +1607,108 @@ class PDFTableExtractor:
         
         return table_data
     
+    def get_classified_lines(self):
+        """
+        Split pdf_text into stripped, non-empty lines and tag each one with classify_lines
+        
+        The result is cached until pdf_text changes, so the text extractors share
+        a single scan of the document.
+        
+        Returns:
+            Tuple of (lines, tags)
+        """
+        if self._classified_lines is None or self._classified_lines[0] is not self.pdf_text:
+            lines = [line.strip() for line in self.pdf_text.split('\n') if line.strip()]
+            self._classified_lines = (self.pdf_text, lines, classify_lines(lines))
+        
+        _, lines, tags = self._classified_lines
+        return lines, tags
+    
+    @register_strategy("bank_statement", cost=3, table_types=("bank_statement",),
+                       description="Bank statement transactions")
     def extract_bank_statement_tables(self):
         """
         Extract tables from bank statements
+        
+        All transaction lines are matched in a single findall over the document and
+        the fields are then converted column-wise, instead of running two regexes,
+        building a dict and calling float() per line. Date is parsed to datetime,
+        Amount to float64 and Type to a Debit/Credit categorical.
         """
         # Split by pages or sections
-        sections = re.split(r'Page No: \d+|Statement of account', self.pdf_text)
-        
-        transactions = []
+        sections = PATTERNS["statement_sections"].split(self.pdf_text)
         
-        # Regular expression to match transaction lines
-        transaction_pattern = r'(\d{2}[-/]\w{3}[-/]\d{4}|\d{2}[-/]\d{2}[-/]\d{4})\s+(.*?)\s+([\d,.]+\.\d{2})\s+(.*?Dr|.*?Cr)'
-        simple_transaction_pattern = r'(\d{2}[-/]\w{3}[-/]\d{4}|\d{2}[-/]\d{2}[-/]\d{4})\s+([A-Z].*?)\s+([\d,.]+\.\d{2})'
+        # Keep candidate lines, skipping empty lines and headers
+        statement_text = "\n".join(
+            line
+            for section in sections
+            for line in section.strip().split('\n')
+            if line.strip() and "BANK NAME" not in line and "BRANCH NAME" not in line
+        )
         
-        for section in sections:
-            lines = section.strip().split('\n')
-            for line in lines:
-                # Skip empty lines and headers
-                if not line.strip() or "BANK NAME" in line or "BRANCH NAME" in line:
-                    continue
-                    
-                # Try to extract transaction using patterns
-                match = re.search(transaction_pattern, line)
-                if not match:
-                    match = re.search(simple_transaction_pattern, line)
-                    
-                if match:
-                    date_str = match.group(1)
-                    description = match.group(2).strip()
-                    amount = match.group(3).strip().replace(',', '')
-                    
-                    # Try to determine if it's debit or credit
-                    is_debit = "Dr" in line or "TO " in description
-                    
-                    transactions.append({
-                        "Date": date_str,
-                        "Description": description,
-                        "Amount": float(amount),
-                        "Type": "Debit" if is_debit else "Credit"
-                    })
+        # One row per matching line: the line itself, then the full pattern's groups,
+        # then the simple pattern's groups (empty strings for the pattern that didn't match)
+        matches = PATTERNS["transaction_lines"].findall(statement_text)
         
         # If transactions were found, convert to DataFrame
-        if transactions:
-            df = pd.DataFrame(transactions)
+        if matches:
+            columns = pd.DataFrame(matches, columns=[
+                "line", "date", "description", "amount", "flag",
+                "simple_date", "simple_description", "simple_amount",
+            ])
+            full_match = columns["date"] != ""
+            
+            date = columns["date"].where(full_match, columns["simple_date"])
+            description = columns["description"].where(full_match, columns["simple_description"]).str.strip()
+            amount = columns["amount"].where(full_match, columns["simple_amount"])
+            amount = amount.str.strip().str.replace(',', '', regex=False).astype('float64')
+            
+            # Try to determine if it's debit or credit
+            is_debit = (columns["line"].str.contains("Dr", regex=False) |
+                        description.str.contains("TO ", regex=False))
+            
+            df = pd.DataFrame({
+                "Date": self.parse_statement_dates(date),
+                "Description": description,
+                "Amount": amount,
+                "Type": pd.Categorical.from_codes(np.where(is_debit, 0, 1), categories=["Debit", "Credit"]),
+            })
             return {"Bank Statement": df}
         
         # Fallback to general table extraction
         return self.extract_general_tables()
     
+    @staticmethod
+    def parse_statement_dates(date_strings):
+        """
+        Parse dd-mmm-yyyy and dd-mm-yyyy dates (with - or / separators) to datetime
+        
+        Dates that match neither format become NaT.
+        """
+        normalized = date_strings.str.replace('/', '-', regex=False)
+        dates = pd.to_datetime(normalized, format='%d-%b-%Y', errors='coerce')
+        missing = dates.isna()
+        if missing.any():
+            dates[missing] = pd.to_datetime(normalized[missing], format='%d-%m-%Y', errors='coerce')
+        return dates
+    
+    @register_strategy("key_value", cost=0.5, table_types=("bank_statement",), supplement=True,
+                       description="Key-value pairs (account information)")
     def extract_vertical_tables(self):
         """
         Extract vertical tables (key-value pairs)
         """
-        # Split text into lines
-        lines = self.pdf_text.split('\n')
-        
-        # Remove empty lines
-        lines = [line.strip() for line in lines if line.strip()]
+        # Split text into stripped, non-empty lines shared with the other text extractors
+        lines, _ = self.get_classified_lines()
         
         # Look for patterns like "Key : Value" or "Key: Value"
         info_data = []
         
+        key_value_pattern = PATTERNS["key_value"]
+        
         for line in lines:
-            # Try to extract key-value pairs
-            match = re.search(r'([A-Za-z0-9\s\./]+)\s*[:]\s*(.+)', line)
+            # Try to extract key-value pairs (only lines with a colon can match)
+            match = key_value_pattern.search(line) if ":" in line else None
             if match:
                 key = match.group(1).strip()
                 value = match.group(2).strip()
@@ -428,18 +1720,17 @@ class PDFTableExtractor:
         
         return {}
     
+    @register_strategy("code_based", cost=0.5, table_types=("code_based",),
+                       description="Code-based tables")
     def extract_code_based_tables(self):
         """
         Extract tables with code-based structure
         """
-        # Split text into lines
-        lines = self.pdf_text.split('\n')
-        
-        # Remove empty lines
-        lines = [line.strip() for line in lines if line.strip()]
+        # Split text into stripped, non-empty lines shared with the other text extractors
+        lines, _ = self.get_classified_lines()
         
         # Look for patterns like "$2 $ $2 $ )0*-*" or similar
-        pattern = r'\$\d+\s+\$\s+\$\d+\s+\$\s+[A-Za-z0-9\*\-]+\s+'
+        pattern = PATTERNS["code_row"]
         
         # Group lines by potential tables
         current_table = []
@@ -448,7 +1739,7 @@ class PDFTableExtractor:
         
         for line in lines:
             # Check if this line could be a new table row
-            if re.match(pattern, line):
+            if pattern.match(line):
                 if not in_table:
                     in_table = True
                     current_table = [line]
@@ -480,7 +1771,7 @@ class PDFTableExtractor:
                 table_data = []
                 for line in table_lines:
                     # Split by multiple spaces
-                    cols = re.split(r'\s{2,}', line)
+                    cols = PATTERNS["multi_space"].split(line)
                     table_data.append(cols)
                 
                 # Find the max columns
@@ -504,6 +1795,8 @@ class PDFTableExtractor:
         
         return processed_tables
     
+    @register_strategy("general", cost=0.5, table_types=("general",),
+                       description="General text tables")
     def extract_general_tables(self):
         """
         Extract general tables based on text structure
@@ -511,11 +1804,8 @@ class PDFTableExtractor:
         tables = {}
         table_count = 0
         
-        # Split text into lines
-        lines = self.pdf_text.split('\n')
-        
-        # Remove empty lines
-        lines = [line.strip() for line in lines if line.strip()]
+        # Split text into lines, tagged once up front instead of re-running patterns per check
+        lines, tags = self.get_classified_lines()
         
         # Variables to track table detection
         in_table = False
@@ -524,10 +1814,12 @@ class PDFTableExtractor:
         current_table_name = None
         
         for i, line in enumerate(lines):
+            tag = tags[i]
+            
             # Check if this line might be a header
-            if (re.search(r'^\s*[A-Za-z\s]+\s*$', line) and 
+            if (tag & LINE_HEADER and 
                 i + 1 < len(lines) and 
-                re.search(r'\d', lines[i + 1])):
+                tags[i + 1] & LINE_HAS_DIGIT):
                 # This could be a table header followed by data
                 if in_table:
                     # Save previous table
@@ -544,7 +1836,7 @@ class PDFTableExtractor:
             
             # If we detect a line with multiple numeric values or specific patterns
             # indicating tabular data
-            if in_table or re.search(r'(\d+\s+){2,}', line) or re.search(r'(\$[\d,.]+\s+){2,}', line):
+            if in_table or tag & (LINE_NUMERIC_ROW | LINE_CURRENCY_ROW):
                 if not in_table:
                     in_table = True
                 
@@ -553,7 +1845,7 @@ class PDFTableExtractor:
                 columns = line.split()
                 
                 # Check if we can identify a better delimiter
-                if len(columns) <= 2 and ("|" in line or "," in line or "\t" in line):
+                if len(columns) <= 2 and tag & LINE_DELIMITED:
                     if "|" in line:
                         columns = [col.strip() for col in line.split("|") if col.strip()]
                     elif "," in line:
@@ -566,7 +1858,7 @@ class PDFTableExtractor:
                     current_table.append(columns)
             else:
                 # Check if we're ending a table
-                if in_table and not re.search(r'(\d+\s+){2,}', line):
+                if in_table and not tag & LINE_NUMERIC_ROW:
                     if current_table:
                         try:
                             # Try to create a DataFrame
@@ -612,6 +1904,8 @@ class PDFTableExtractor:
         
         return tables
     
+    @register_strategy("line_based", cost=1.5, table_types=("general",),
+                       description="Line-based text tables")
     def extract_line_based_tables(self):
         """
         Fallback method for table extraction
@@ -620,7 +1914,10 @@ class PDFTableExtractor:
         table_count = 0
         
         # Split by potential table boundaries
-        sections = re.split(r'-{5,}|={5,}|\*{5,}', self.pdf_text)
+        sections = PATTERNS["section_rule"].split(self.pdf_text)
+        
+        digit_pattern = PATTERNS["digit"]
+        multi_space_pattern = PATTERNS["multi_space"]
         
         for section in sections:
             lines = section.strip().split('\n')
@@ -636,12 +1933,12 @@ class PDFTableExtractor:
                     continue
                 
                 # Check if line has numeric content
-                if re.search(r'\d', line):
+                if digit_pattern.search(line):
                     # Split on consistent delimiters or whitespace patterns
                     if '|' in line:
                         columns = [col.strip() for col in line.split('|') if col.strip()]
-                    elif re.search(r'\s{2,}', line):
-                        columns = re.split(r'\s{2,}', line)
+                    elif multi_space_pattern.search(line):
+                        columns = multi_space_pattern.split(line)
                     else:
                         columns = line.split()
                     
@@ -657,4 +1954,341 @@ class PDFTableExtractor:
                 tables[f"Table_{table_count}"] = table_df
                 table_count += 1
         
-        return tables
\ No newline at end of file
+        return tables
+
+
+class StreamingExcelWriter:
+    """
+    Write tables to an Excel workbook row by row using xlsxwriter's constant_memory mode
+    
+    Each row is flushed to disk as soon as the next one starts, so memory use stays flat
+    no matter how large the tables are. Column widths come from a running max-length
+    tracker updated while rows are written, rather than a string copy of every column.
+    Tables must be written one at a time, each sheet top to bottom.
+    """
+    def __init__(self, output):
+        """
+        Args:
+            output: File path or writable, seekable binary file object (e.g. a spooled temp file)
+        """
+        self.workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+        self.header_format = self.workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        self.datetime_format = self.workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+        self.worksheet = None
+        self.column_widths = []
+        self.row_num = 0
+        # Lowercased names of the sheets written so far; Excel ignores case when comparing them
+        self.sheet_names = set()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def begin_sheet(self, sheet_name, columns):
+        """
+        Start a new sheet and write its header row
+        """
+        self.end_sheet()
+        
+        # Clean the sheet name (Excel has a 31 character limit and doesn't allow certain characters)
+        valid_sheet_name = re.sub(r'[\\/*?:[\]]', '', sheet_name)
+        valid_sheet_name = valid_sheet_name[:31] or "Sheet"
+        
+        # Names that collide once truncated get a numbered suffix instead of failing the workbook
+        unique_sheet_name = valid_sheet_name
+        suffix = 2
+        while unique_sheet_name.lower() in self.sheet_names:
+            unique_sheet_name = f"{valid_sheet_name[:31 - len(str(suffix)) - 1]}_{suffix}"
+            suffix += 1
+        self.sheet_names.add(unique_sheet_name.lower())
+        
+        self.worksheet = self.workbook.add_worksheet(unique_sheet_name)
+        self.column_widths = [len(str(col)) for col in columns]
+        for col_num, col in enumerate(columns):
+            self.worksheet.write(0, col_num, str(col), self.header_format)
+        self.row_num = 1
+    
+    def write_rows(self, rows):
+        """
+        Append rows (iterables of cell values) to the current sheet
+        """
+        worksheet = self.worksheet
+        column_widths = self.column_widths
+        
+        for row in rows:
+            for col_num, value in enumerate(row):
+                # Missing values are left blank, as DataFrame.to_excel does
+                if value is None or value is pd.NaT or (isinstance(value, float) and value != value):
+                    continue
+                
+                if isinstance(value, datetime):
+                    worksheet.write_datetime(self.row_num, col_num, value, self.datetime_format)
+                else:
+                    worksheet.write(self.row_num, col_num, value)
+                
+                # Keep a running max of the rendered length for column widths
+                length = len(str(value))
+                if col_num >= len(column_widths):
+                    column_widths.append(length)
+                elif length > column_widths[col_num]:
+                    column_widths[col_num] = length
+            self.row_num += 1
+    
+    def write_table(self, sheet_name, df):
+        """
+        Write a whole DataFrame as its own sheet
+        """
+        self.begin_sheet(sheet_name, df.columns)
+        self.write_rows(df.itertuples(index=False, name=None))
+        self.end_sheet()
+    
+    def end_sheet(self):
+        """
+        Finish the current sheet by applying the tracked column widths
+        """
+        if self.worksheet is None:
+            return
+        
+        # Auto-adjust column widths
+        for col_num, width in enumerate(self.column_widths):
+            self.worksheet.set_column(col_num, col_num, width + 2)
+        self.worksheet = None
+    
+    def close(self):
+        self.end_sheet()
+        self.workbook.close()
+
+
+def save_tables_to_excel(tables, output):
+    """
+    Write extracted tables to an Excel workbook, one sheet per table
+    
+    Args:
+        tables: Dictionary with table names as keys and DataFrames as values, or an
+            iterable of (table_name, DataFrame) pairs such as PDFTableExtractor.iter_tables(),
+            in which case each table is written as soon as it is produced
+        output: File path or writable, seekable binary file object
+    """
+    if isinstance(tables, dict):
+        tables = tables.items()
+    
+    with StreamingExcelWriter(output) as writer:
+        for sheet_name, df in tables:
+            writer.write_table(sheet_name, df)
+
+
+def find_pdf_files(inputs, recursive=False):
+    """
+    Expand files, directories and glob patterns into a sorted list of PDF paths
+    """
+    pdf_files = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            pattern = os.path.join(item, '**', '*.pdf') if recursive else os.path.join(item, '*.pdf')
+            matches = glob.glob(pattern, recursive=recursive)
+        else:
+            matches = glob.glob(item, recursive=recursive)
+        pdf_files.update(path for path in matches if os.path.isfile(path) and path.lower().endswith('.pdf'))
+    return sorted(pdf_files)
+
+
+def workbook_paths(pdf_files, output_dir):
+    """
+    Choose a workbook path under output_dir for every PDF
+    
+    The PDFs' directories are mirrored below their deepest common directory, so
+    a/stmt.pdf and b/stmt.pdf become <output_dir>/a/stmt.xlsx and
+    <output_dir>/b/stmt.xlsx. Names that still collide, such as stmt.pdf and
+    stmt.PDF on a case-insensitive file system, get a numbered suffix.
+    
+    Returns:
+        Dictionary mapping each PDF path to its workbook path
+    """
+    absolute_paths = [os.path.abspath(pdf_path) for pdf_path in pdf_files]
+    try:
+        base = os.path.commonpath([os.path.dirname(path) for path in absolute_paths])
+    except ValueError:
+        # Paths on different drives share no directory
+        base = None
+    
+    paths = {}
+    used = set()
+    for pdf_path, absolute_path in zip(pdf_files, absolute_paths):
+        relative_path = os.path.relpath(absolute_path, base) if base else os.path.basename(absolute_path)
+        stem = os.path.join(output_dir, os.path.splitext(relative_path)[0])
+        output_path = stem + '.xlsx'
+        suffix = 2
+        while os.path.normcase(output_path).lower() in used:
+            output_path = f"{stem}_{suffix}.xlsx"
+            suffix += 1
+        if suffix > 2:
+            print(f"NOTE  {pdf_path} would overwrite another workbook; writing {output_path}", file=sys.stderr)
+        used.add(os.path.normcase(output_path).lower())
+        paths[pdf_path] = output_path
+    return paths
+
+
+def parse_page_ranges(spec):
+    """
+    Parse a 1-based page specification such as "1-5,9" into zero-based page indexes
+    """
+    page_numbers = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        first = int(first)
+        last = int(last) if last else first
+        if first < 1 or last < first:
+            raise ValueError(f"Invalid page range: {part}")
+        page_numbers.update(range(first - 1, last))
+    return sorted(page_numbers)
+
+
+def convert_pdf_to_excel(pdf_path, output_dir, text_source="layout", layout_profile="balanced", layout_cache=None,
+                         strategy="auto", planner=None, template_index=None, stitch_tables=False,
+                         infer_types=False, output_path=None, page_workers=1, **extract_options):
+    """
+    Extract tables from one PDF and write them to <output_dir>/<name>.xlsx
+    
+    Args:
+        output_path: Workbook path to write instead, such as one from workbook_paths
+        page_workers: Processes to split the PDF's layout detection across by page range
+        extract_options: Passed to PDFTableExtractor.extract_tables (pages, max_tables, ...)
+    
+    Returns:
+        Dictionary with the input path, output path, table count, timing and any error;
+        with infer_types, also the tables' memory as strings and typed
+    """
+    start = time.perf_counter()
+    result = {"pdf": pdf_path, "output": None, "tables": 0, "seconds": 0.0, "error": None}
+    if output_path is None:
+        output_path = os.path.join(output_dir, os.path.splitext(os.path.basename(pdf_path))[0] + '.xlsx')
+    try:
+        with PDFTableExtractor(file_path=pdf_path, text_source=text_source, layout_profile=layout_profile,
+                               layout_cache=layout_cache, strategy=strategy, planner=planner,
+                               template_index=template_index, stitch_tables=stitch_tables,
+                               infer_types=infer_types, page_workers=page_workers) as processor:
+            tables = processor.extract_tables(**extract_options)
+        result["tables"] = len(tables)
+        if infer_types:
+            report = memory_report(tables)
+            result["text_bytes"] = report["text_bytes"]
+            result["typed_bytes"] = report["typed_bytes"]
+        
+        if tables:
+            output_dir = os.path.dirname(output_path) or "."
+            os.makedirs(output_dir, exist_ok=True)
+            # Write next to the workbook and rename, so a failure or crash mid-write
+            # never truncates or removes the workbook from an earlier run
+            file_descriptor, temp_path = tempfile.mkstemp(dir=output_dir, prefix=".tmp-", suffix=".xlsx")
+            os.close(file_descriptor)
+            try:
+                save_tables_to_excel(tables, temp_path)
+                os.replace(temp_path, output_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            result["output"] = output_path
+    except Exception as e:
+        result["error"] = str(e)
+    
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def main(argv=None):
+    """
+    Command line entry point for headless batch conversion
+    
+    Exit codes: 0 if every file converted, 1 if any file failed, 2 if no PDFs were found
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m pdf_processor",
+        description="Extract tables from PDFs and write one Excel workbook per PDF",
+    )
+    parser.add_argument("inputs", nargs="+", help="PDF files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", default=".", help="Directory for the Excel workbooks")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of PDFs converted in parallel (default: CPU count)")
+    parser.add_argument("--page-workers", type=int, default=1, metavar="N",
+                        help="Split each PDF's layout detection across N processes by page range, "
+                             "for a few long PDFs; combine with a lower -j")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Search directories recursively")
+    parser.add_argument("--text-source", choices=["layout", "pypdf2"], default="layout",
+                        help="How to build the text used by the text-based extractors")
+    parser.add_argument("--layout-profile", choices=sorted(LAYOUT_PROFILES), default="balanced",
+                        help="pdfminer layout analysis settings: fast, balanced or accurate")
+    parser.add_argument("--layout-cache", metavar="DIR",
+                        help="Cache pdfminer layouts in DIR so re-runs on the same PDFs skip layout analysis")
+    parser.add_argument("--strategy", choices=["auto"] + list(STRATEGIES), default="auto",
+                        help="Run only this extraction strategy instead of choosing automatically")
+    parser.add_argument("--planner", metavar="FILE",
+                        help="Order strategies from cheap page-1 features and remember the winner per "
+                             "template in FILE, so recurring layouts skip failed strategies "
+                             "(requires --text-source pypdf2)")
+    parser.add_argument("--template-index", metavar="FILE",
+                        help="Learn the table columns of recurring document templates in FILE and slice "
+                             "later documents of a known template by them")
+    parser.add_argument("--stitch", action="store_true",
+                        help="Join tables that continue onto the next page into a single table")
+    parser.add_argument("--typed", action="store_true",
+                        help="Convert columns of amounts, dates and repeated strings to numeric, date and "
+                             "categorical types, and report the tables' memory before and after")
+    parser.add_argument("--pages", type=parse_page_ranges,
+                        help="Only parse these 1-based pages, e.g. \"1-5,9\"")
+    parser.add_argument("--max-tables", type=int, help="Stop after this many tables per PDF")
+    parser.add_argument("--first-match", action="store_true",
+                        help="Stop after the first page or text strategy that yields tables")
+    args = parser.parse_args(argv)
+    if args.planner and args.text_source != "pypdf2":
+        parser.error("--planner requires --text-source pypdf2")
+    
+    extract_options = {
+        "pages": args.pages,
+        "max_tables": args.max_tables,
+        "stop_after_first_match": args.first_match,
+    }
+    
+    pdf_files = find_pdf_files(args.inputs, args.recursive)
+    if not pdf_files:
+        print("No PDF files found", file=sys.stderr)
+        return 2
+    
+    os.makedirs(args.output_dir, exist_ok=True)
+    layout_cache = LayoutCache(args.layout_cache) if args.layout_cache else None
+    planner = StrategyPlanner(args.planner) if args.planner else None
+    template_index = TemplateIndex(args.template_index) if args.template_index else None
+    output_paths = workbook_paths(pdf_files, args.output_dir)
+    
+    start = time.perf_counter()
+    failures = 0
+    total_tables = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = [executor.submit(convert_pdf_to_excel, pdf_path, args.output_dir, args.text_source,
+                                   args.layout_profile, layout_cache, args.strategy, planner, template_index,
+                                   args.stitch, args.typed, output_path=output_paths[pdf_path],
+                                   page_workers=args.page_workers, **extract_options)
+                   for pdf_path in pdf_files]
+        for future in futures:
+            result = future.result()
+            if result["error"]:
+                failures += 1
+                print(f"FAIL  {result['pdf']}  {result['seconds']:.2f}s  {result['error']}", file=sys.stderr)
+            else:
+                total_tables += result["tables"]
+                memory = (f"{result['text_bytes'] / 1024:.0f} KB -> {result['typed_bytes'] / 1024:.0f} KB typed  "
+                          if "typed_bytes" in result else "")
+                print(f"OK    {result['pdf']}  {result['seconds']:.2f}s  {result['tables']} tables  {memory}"
+                      f"-> {result['output'] or '(no tables, nothing written)'}")
+    
+    print(f"Processed {len(pdf_files)} files in {time.perf_counter() - start:.2f}s: "
+          f"{len(pdf_files) - failures} succeeded, {failures} failed, {total_tables} tables")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
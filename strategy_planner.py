@@ -0,0 +1,110 @@
+import hashlib
+import json
+import threading
+
+from json_store import JsonStore
+
+# Document types whose text strategies are tried before layout detection when the
+# first page has (almost) no drawn rules
+TEXT_FIRST_TYPES = ("bank_statement", "code_based")
+
+# Rectangles plus line segments on page 1 from which a page counts as ruled
+RULED_PAGE_MIN_SHAPES = 4
+
+# Bump whenever template keys change meaning, to ignore older winners
+STRATEGY_PLANNER_VERSION = 2
+
+
+class StrategyPlanner:
+    """
+    Orders extraction strategies by expected cost, learning which one wins per template
+
+    Plans are made from cheap document features (drawn shapes on page 1, the
+    page-1 document type and header labels, see PDFTableExtractor.get_plan_features)
+    instead of running the full layout pass and every fallback. The strategy that
+    produced the tables is remembered per template, so later documents of the same
+    template try it first. Winners are optionally persisted to a JSON file.
+
+    Planning only pays off when the text strategies don't need the layout pass,
+    so PDFTableExtractor accepts a planner with text_source="pypdf2" only.
+    """
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Optional JSON file where winning strategies are kept across runs
+        """
+        self.path = path
+        self.store = JsonStore(path)
+        self.planned = 0
+        self.learned_plans = 0
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        return {"store": self.store}
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.path = state["store"].path
+        self.store = state["store"]
+
+    @property
+    def winners(self):
+        """
+        Dictionary of template keys to the strategy that won for them
+        """
+        return self.store.entries
+
+    @staticmethod
+    def template_key(features):
+        """
+        Identify a document template from its type and page-1 header labels (see
+        template_index.header_labels), so each customer's statements share one key
+        """
+        payload = json.dumps({"version": STRATEGY_PLANNER_VERSION, "table_type": features["table_type"],
+                              "labels": features["labels"]}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def plan(self, features, strategies):
+        """
+        Order strategies so the cheapest one likely to succeed runs first
+
+        Args:
+            features: Dictionary from PDFTableExtractor.get_plan_features
+            strategies: Candidate ExtractionStrategy objects, cheapest first
+
+        Returns:
+            The same strategies, reordered
+        """
+        layout = [strategy for strategy in strategies if strategy.needs_layout]
+        text = [strategy for strategy in strategies if not strategy.needs_layout]
+
+        # Layout detection first, as extract_tables does, unless page 1 looks like a
+        # text-only statement or code listing
+        if features["table_type"] in TEXT_FIRST_TYPES and features["shapes"] < RULED_PAGE_MIN_SHAPES:
+            plan = text + layout
+        else:
+            plan = layout + text
+
+        winner = self.store.get(self.template_key(features))
+        with self.lock:
+            self.planned += 1
+            if winner is not None:
+                self.learned_plans += 1
+
+        # A template seen before goes straight to the strategy that won last time
+        if winner is not None:
+            plan.sort(key=lambda strategy: strategy.name != winner)
+        return plan
+
+    def record(self, features, strategy_name):
+        """
+        Remember the strategy that produced tables for this document's template
+        """
+        self.store.update({self.template_key(features): strategy_name})
+
+    def stats(self):
+        """
+        Number of plans made, how many used a learned winner, and known templates
+        """
+        with self.lock:
+            return {"planned": self.planned, "learned": self.learned_plans, "templates": len(self.store)}
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+class TableCache:
+    """
+    Content-addressed cache of extracted tables
+
+    Results are keyed on the SHA-256 of the PDF bytes plus the extractor settings,
+    held in an in-memory LRU bounded by a byte budget, and optionally persisted to
+    disk as one pickle per table so they survive restarts. The disk store has its
+    own budget; entries are evicted least recently used first, by the modification
+    time of their directory, which a disk hit refreshes.
+    """
+    def __init__(self, max_bytes=256 * 1024 * 1024, cache_dir=None, max_disk_bytes=1024 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Memory budget for cached DataFrames
+            cache_dir: Optional directory for the on-disk store
+            max_disk_bytes: Budget for the pickled tables in cache_dir
+        """
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self.lock = threading.Lock()
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(pdf_bytes, settings=None):
+        """
+        Build a cache key from the PDF content and extractor settings
+        """
+        digest = hashlib.sha256(pdf_bytes)
+        digest.update(json.dumps(settings or {}, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def tables_size(tables):
+        """
+        Approximate memory footprint of a table dictionary in bytes
+        """
+        return int(sum(df.memory_usage(index=True, deep=True).sum() for df in tables.values()))
+
+    def get(self, key):
+        """
+        Return cached tables for key, or None on a miss
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return dict(self.entries[key][0])
+
+        tables = self._load_from_disk(key)
+
+        with self.lock:
+            if tables is None:
+                self.misses += 1
+                return None
+
+            self.disk_hits += 1
+            self._store(key, tables)
+            return dict(tables)
+
+    def put(self, key, tables):
+        """
+        Cache tables under key, evicting least recently used entries if needed
+
+        Returns:
+            True if the tables are now held in memory or on disk, False if they
+            exceed every budget
+        """
+        with self.lock:
+            in_memory = self._store(key, tables)
+
+        return self._save_to_disk(key, tables) or in_memory
+
+    def get_or_extract(self, pdf_bytes, extract, settings=None):
+        """
+        Return cached tables for the PDF, calling extract() on a miss
+        """
+        key = self.make_key(pdf_bytes, settings)
+        tables = self.get(key)
+        if tables is None:
+            tables = extract()
+            self.put(key, tables)
+        return tables
+
+    def stats(self):
+        """
+        Hit, miss and eviction counters plus current memory usage
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "entries": len(self.entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self):
+        """
+        Drop every in-memory entry and the on-disk store
+        """
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _store(self, key, tables):
+        size = self.tables_size(tables)
+
+        # Results larger than the whole budget only go to disk
+        if size > self.max_bytes:
+            return False
+
+        if key in self.entries:
+            self.current_bytes -= self.entries.pop(key)[1]
+
+        self.entries[key] = (dict(tables), size)
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+
+        return True
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def _save_to_disk(self, key, tables):
+        """
+        Returns:
+            True if the entry is on disk afterwards
+        """
+        if not self.cache_dir:
+            return False
+        if os.path.isdir(self._entry_dir(key)):
+            return True
+
+        # Write into a temporary directory and rename so readers never see partial entries
+        temp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-")
+        try:
+            for i, (table_name, df) in enumerate(tables.items()):
+                with open(os.path.join(temp_dir, f"{i:05d}.pkl"), "wb") as file:
+                    pickle.dump((table_name, df), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.rename(temp_dir, self._entry_dir(key))
+        except Exception:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return False
+
+        self._prune_disk()
+        # Entries larger than the whole disk budget are pruned straight away
+        return os.path.isdir(self._entry_dir(key))
+
+    def _prune_disk(self):
+        """
+        Remove least recently used entries until the disk store fits max_disk_bytes
+        """
+        entries = []
+        total_bytes = 0
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            if name.startswith(".tmp-"):
+                continue
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(entry_dir))
+                entries.append((os.stat(entry_dir).st_mtime, size, entry_dir))
+            except OSError:
+                # Removed by another process in the meantime
+                continue
+            total_bytes += size
+
+        for _, size, entry_dir in sorted(entries):
+            if total_bytes <= self.max_disk_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_bytes -= size
+            with self.lock:
+                self.disk_evictions += 1
+
+    def _load_from_disk(self, key):
+        if not self.cache_dir:
+            return None
+
+        entry_dir = self._entry_dir(key)
+        if not os.path.isdir(entry_dir):
+            return None
+
+        tables = {}
+        try:
+            for file_name in sorted(os.listdir(entry_dir)):
+                with open(os.path.join(entry_dir, file_name), "rb") as file:
+                    table_name, df = pickle.load(file)
+                tables[table_name] = df
+            # Mark the entry as recently used for _prune_disk
+            os.utime(entry_dir)
+        except Exception:
+            # Truncated, corrupt or written by an incompatible version: drop it
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+        return tables
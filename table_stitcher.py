@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+
+class TableFragment:
+    """
+    A table detected on one page, before it becomes a DataFrame
+
+    Holds the cells as a 2-D object array and the x position where each column
+    starts (NaN where unknown), which is what continuation pages are matched on.
+    """
+    __slots__ = ("name", "page_num", "cells", "edges")
+
+    def __init__(self, name, page_num, cells, edges):
+        self.name = name
+        self.page_num = page_num
+        self.cells = cells
+        self.edges = edges
+
+    @property
+    def num_cols(self):
+        return self.cells.shape[1]
+
+    def to_frame(self):
+        return pd.DataFrame(self.cells)
+
+
+class ColumnBuffer:
+    """
+    Growable column-major buffer of table cells
+
+    Rows are appended into one (columns, capacity) object array whose capacity
+    doubles when full, so a table spanning hundreds of pages is copied O(log n)
+    times instead of once per page by repeated concatenation.
+    """
+    def __init__(self, num_cols, capacity=256):
+        self.columns = np.empty((num_cols, capacity), dtype=object)
+        self.size = 0
+
+    def append(self, cells):
+        """
+        Append a (rows, columns) array of cells
+        """
+        end = self.size + len(cells)
+        if end > self.columns.shape[1]:
+            grown = np.empty((self.columns.shape[0], max(end, 2 * self.columns.shape[1])), dtype=object)
+            grown[:, :self.size] = self.columns[:, :self.size]
+            self.columns = grown
+        self.columns[:, self.size:end] = cells.T
+        self.size = end
+
+    def to_frame(self):
+        # Trim the spare capacity; pandas keeps the column-major block as is
+        return pd.DataFrame(self.columns[:, :self.size].copy().T)
+
+
+class TableStitcher:
+    """
+    Joins tables that continue from one page onto the next
+
+    A page's first table continues the previous page's last table when it has the
+    same number of columns and its columns start within tolerance of the same x
+    positions. A repeated header row on the continuation page is dropped.
+    Continued tables keep the name of their first fragment, and their rows are
+    appended into a single ColumnBuffer that becomes a DataFrame once, when the
+    table ends.
+
+    Pages are fed in order with add_page, which returns the tables that can no
+    longer continue, so tables can be streamed out while the document is parsed.
+    """
+    def __init__(self, tolerance=15):
+        """
+        Args:
+            tolerance: Maximum difference in points between matching column starts
+        """
+        self.tolerance = tolerance
+        self.last_page_num = None
+        # The last table of the previous page, the only one that may still continue:
+        # its first fragment, its buffer once a continuation arrives, and its header
+        self.open_fragment = None
+        self.open_buffer = None
+        self.open_header = None
+
+    def add_page(self, page_num, fragments):
+        """
+        Add the tables found on a page, in page order
+
+        Args:
+            page_num: Zero-based page number; a gap in numbering ends the open table
+            fragments: List of TableFragment detected on the page
+
+        Returns:
+            List of (table_name, DataFrame) pairs for the tables ended by this page
+        """
+        closed = []
+        for position, fragment in enumerate(fragments):
+            if position == 0 and self.continues(page_num, fragment):
+                cells = fragment.cells
+                if len(cells) and self.open_header is not None and np.array_equal(cells[0], self.open_header):
+                    cells = cells[1:]
+                if self.open_buffer is None:
+                    self.open_buffer = ColumnBuffer(self.open_fragment.num_cols,
+                                                    capacity=max(256, 4 * len(self.open_fragment.cells)))
+                    self.open_buffer.append(self.open_fragment.cells)
+                self.open_buffer.append(cells)
+                continue
+
+            if self.open_fragment is not None:
+                closed.append(self.close())
+            self.open_fragment = fragment
+            self.open_header = fragment.cells[0] if len(fragment.cells) else None
+
+        if not fragments and self.open_fragment is not None:
+            closed.append(self.close())
+
+        self.last_page_num = page_num
+        return closed
+
+    def finish(self):
+        """
+        End the document and return the remaining (table_name, DataFrame) pairs
+        """
+        return [self.close()] if self.open_fragment is not None else []
+
+    def continues(self, page_num, fragment):
+        """
+        Whether fragment, the first table on page_num, continues the open table
+        """
+        if self.open_fragment is None or page_num != self.last_page_num + 1:
+            return False
+        if fragment.num_cols != self.open_fragment.num_cols:
+            return False
+
+        # Columns that were empty on either page can't be compared
+        differences = np.abs(fragment.edges - self.open_fragment.edges)
+        return bool(np.all(np.isnan(differences) | (differences <= self.tolerance)))
+
+    def close(self):
+        """
+        End the open table and return it as a (table_name, DataFrame) pair
+        """
+        fragment = self.open_fragment
+        table = (fragment.name, self.open_buffer.to_frame() if self.open_buffer is not None else fragment.to_frame())
+        self.open_fragment = None
+        self.open_buffer = None
+        self.open_header = None
+        return table
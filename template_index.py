@@ -0,0 +1,134 @@
+import hashlib
+import json
+import re
+import threading
+
+import numpy as np
+
+from json_store import JsonStore
+
+# Bump whenever fingerprints or stored plans change meaning, to ignore older entries
+TEMPLATE_INDEX_VERSION = 1
+
+# Grid, in points, that page-1 rectangles and lines are snapped to before hashing
+GRID_SIZE = 10
+
+# Leading page-1 lines hashed for documents without "Label: value" lines
+HEADER_LINES = 3
+
+LABEL_PATTERN = re.compile(r'^([^:\d]{2,40}?)\s*:')
+DIGIT_PATTERN = re.compile(r'\d')
+
+
+def header_labels(lines):
+    """
+    Normalized labels of a page's "Label: value" lines, so account holders, addresses
+    and dates don't matter; pages without any fall back to their first HEADER_LINES
+    lines with digits masked
+
+    Args:
+        lines: The page's non-empty, stripped text lines
+    """
+    labels = sorted({" ".join(match.group(1).split()).upper()
+                     for match in map(LABEL_PATTERN.match, lines) if match})
+    if not labels:
+        labels = [DIGIT_PATTERN.sub("#", line) for line in lines[:HEADER_LINES]]
+    return labels
+
+
+class TemplateIndex:
+    """
+    Index of recurring document templates and the table layout learned for each
+
+    Documents are fingerprinted from their first page: a hash of each header label
+    (the text before the colon of "Label: value" lines, so account holders and
+    dates don't matter) and the page's rectangles and lines snapped to a coarse
+    grid. The first document of a template is detected with the borderless
+    heuristics; the column x-boundaries and row threshold of its largest table are
+    then stored, and later documents with the same fingerprint slice their rows
+    by those boundaries instead. Plans are optionally persisted to a JSON file.
+    """
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Optional JSON file where learned plans are kept across runs
+        """
+        self.path = path
+        self.store = JsonStore(path)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        return {"store": self.store}
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.path = state["store"].path
+        self.store = state["store"]
+
+    @property
+    def plans(self):
+        """
+        Dictionary of fingerprints to learned plans
+        """
+        return self.store.entries
+
+    @staticmethod
+    def fingerprint(layout):
+        """
+        Fingerprint a document from the PageLayout of its first page
+        """
+        lines = [line.strip() for text in layout.texts for line in text.split('\n') if line.strip()]
+        labels = header_labels(lines)
+
+        shapes = np.concatenate((layout.rects, layout.lines)) if len(layout.lines) else layout.rects
+        grid = np.unique(np.round(shapes / GRID_SIZE).astype(np.int64), axis=0) if len(shapes) else shapes
+
+        digest = hashlib.sha256(json.dumps({
+            "version": TEMPLATE_INDEX_VERSION,
+            "labels": [hashlib.sha256(label.encode("utf-8")).hexdigest() for label in labels],
+        }, sort_keys=True).encode("utf-8"))
+        digest.update(grid.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Return the plan learned for a fingerprint, or None if the template is new
+        """
+        plan = self.store.get(key)
+        with self.lock:
+            if plan is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return plan
+
+    def put(self, key, plan):
+        """
+        Store the plan learned for a fingerprint
+
+        Args:
+            key: Fingerprint from TemplateIndex.fingerprint
+            plan: Dictionary with "columns" (ascending column x-boundaries),
+                "row_threshold" (points between rows) and "sample_rows" (complete
+                rows the boundaries were measured on)
+        """
+        self.store.update({key: plan})
+
+    def merge(self, plans):
+        """
+        Add plans learned elsewhere, such as by a copy of this index in a worker
+        process, keeping the plans already known for the same fingerprints
+
+        Args:
+            plans: Dictionary of fingerprints to plans, as in TemplateIndex.plans
+        """
+        self.store.update(plans, replace=False)
+
+    def stats(self):
+        """
+        Hit and miss counters plus the number of known templates
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "templates": len(self.store)}
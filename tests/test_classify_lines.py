@@ -0,0 +1,30 @@
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_processor import LINE_CURRENCY_ROW, LINE_HEADER, LINE_NUMERIC_ROW, classify_lines
+
+# The patterns classify_lines stands in for
+HEADER = re.compile(r'^\s*[A-Za-z\s]+\s*$')
+NUMERIC_ROW = re.compile(r'(\d+\s+){2,}')
+CURRENCY_ROW = re.compile(r'(\$[\d,.]+\s+){2,}')
+
+
+def test_tags_match_the_original_patterns():
+    lines = [
+        "Date Description Amount",
+        "01 02 2024 Opening balance",
+        "$1,234.50 $20.00 Deposit",
+        "$.. $, x",
+        "$, $. ",
+        "$1 $2",
+        "Total $ 5 $ 6",
+        "12 x 3",
+    ]
+
+    for line, tag in zip(lines, classify_lines(lines)):
+        assert bool(tag & LINE_HEADER) == bool(HEADER.search(line)), line
+        assert bool(tag & LINE_NUMERIC_ROW) == bool(NUMERIC_ROW.search(line)), line
+        assert bool(tag & LINE_CURRENCY_ROW) == bool(CURRENCY_ROW.search(line)), line
@@ -0,0 +1,94 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from column_types import infer_table_types, memory_report
+
+
+def infer_column(values, promote_header=False):
+    typed = infer_table_types(pd.DataFrame({0: values}), promote_header)
+    return typed.attrs["column_types"]["0"], typed.iloc[:, 0]
+
+
+def test_debits_and_credits():
+    kind, column = infer_column(["1,234.50 Dr", "200.00 Cr", "15.25dr."])
+
+    assert kind == "currency"
+    assert column.tolist() == [-1234.5, 200.0, -15.25]
+
+
+def test_parentheses_and_minus_signs_are_negative():
+    kind, column = infer_column(["(50.00)", "-20.5", "30.00-", "$ 10.00"])
+
+    assert kind == "currency"
+    assert column.tolist() == [-50.0, -20.5, -30.0, 10.0]
+
+
+def test_indian_and_western_grouping():
+    kind, column = infer_column(["12,34,567.00", "1,00,000", "1,234,567.25", "999"])
+
+    assert kind == "number"
+    assert column.tolist() == [1234567.0, 100000.0, 1234567.25, 999.0]
+
+
+def test_malformed_grouping_stays_text():
+    # European decimals, not thousands separators
+    for values in (["12,34", "5,50", "1,00"], ["1,2345", "2,000"], ["12,34,56"]):
+        kind, column = infer_column(values)
+
+        assert kind == "text"
+        assert column.tolist() == values
+
+
+def test_zero_padded_codes_and_long_identifiers_stay_text():
+    assert infer_column(["00123", "00456", "00789"])[0] == "text"
+    assert infer_column(["1234567890123456", "2234567890123456"])[0] == "text"
+
+
+def test_integers_with_gaps_become_floats():
+    kind, column = infer_column(["1", "", "3"])
+
+    assert kind == "integer"
+    assert column.dtype == np.float64
+    assert column.isna().tolist() == [False, True, False]
+
+
+def test_dates_use_the_first_format_that_fits():
+    kind, column = infer_column(["01/02/2024", "15/02/2024"])
+
+    assert kind == "date"
+    assert column.tolist() == [pd.Timestamp(2024, 2, 1), pd.Timestamp(2024, 2, 15)]
+
+
+def test_header_row_is_promoted_above_typed_columns():
+    table = pd.DataFrame([["Date", "Type", "Amount"],
+                          ["01-02-2024", "UPI", "1,200.00"],
+                          ["02-02-2024", "UPI", "50.00 Dr"],
+                          ["03-02-2024", "NEFT", "10.00"],
+                          ["04-02-2024", "UPI", "5.00"]])
+
+    typed = infer_table_types(table)
+
+    assert list(typed.columns) == ["Date", "Type", "Amount"]
+    assert typed.attrs["column_types"] == {"Date": "date", "Type": "category", "Amount": "currency"}
+    assert typed["Amount"].tolist() == [1200.0, -50.0, 10.0, 5.0]
+
+
+def test_header_row_with_digits_is_kept_as_data():
+    typed = infer_table_types(pd.DataFrame([["Year 2024"], ["1"], ["2"]]))
+
+    assert list(typed.columns) == [0]
+    assert typed.attrs["column_types"]["0"] == "text"
+
+
+def test_memory_report_counts_converted_columns():
+    typed = infer_table_types(pd.DataFrame({0: ["1.50", "2.50"] * 50, 1: ["a", "b"] * 50}), promote_header=False)
+
+    report = memory_report({"Table_1": typed})
+
+    assert report["columns"] == {"number": 1, "category": 1}
+    assert report["typed_bytes"] < report["text_bytes"]
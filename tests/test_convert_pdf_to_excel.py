@@ -0,0 +1,39 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdf_processor
+from pdf_processor import convert_pdf_to_excel
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples", "test3.pdf")
+
+
+def test_failed_conversion_keeps_the_previous_workbook(tmp_path):
+    corrupt_pdf = tmp_path / "statement.pdf"
+    with open(SAMPLE_PDF, "rb") as file:
+        corrupt_pdf.write_bytes(file.read(3000))
+    previous = tmp_path / "statement.xlsx"
+    previous.write_bytes(b"workbook from last night")
+
+    result = convert_pdf_to_excel(str(corrupt_pdf), str(tmp_path))
+
+    assert result["error"]
+    assert previous.read_bytes() == b"workbook from last night"
+
+
+def test_failed_write_leaves_no_partial_workbook(tmp_path, monkeypatch):
+    previous = tmp_path / "test3.xlsx"
+    previous.write_bytes(b"workbook from last night")
+
+    def failing_save(tables, output):
+        with open(output, "wb") as file:
+            file.write(b"partial")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pdf_processor, "save_tables_to_excel", failing_save)
+    result = convert_pdf_to_excel(SAMPLE_PDF, str(tmp_path))
+
+    assert result["error"] == "disk full"
+    assert sorted(os.listdir(tmp_path)) == ["test3.xlsx"]
+    assert previous.read_bytes() == b"workbook from last night"
@@ -0,0 +1,40 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_processor import PDFTableExtractor
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples", "test3.pdf")
+
+
+def test_close_releases_the_mapping_while_streams_are_open():
+    with PDFTableExtractor(file_path=SAMPLE_PDF) as extractor:
+        # A layout pass stopped early leaves its reader open
+        pages = extractor.iter_layout_pages()
+        next(pages)
+        stream = extractor.open_pdf_stream()
+
+    assert extractor._mmap is None
+    assert stream.closed
+    pages.close()
+
+
+def test_close_tolerates_views_held_by_callers():
+    extractor = PDFTableExtractor(file_path=SAMPLE_PDF)
+    header = extractor.get_pdf_data()[:5]
+
+    extractor.close()
+
+    assert extractor._mmap is None
+    assert header.tobytes() == b"%PDF-"
+
+
+def test_use_mmap_false_reads_the_file():
+    with PDFTableExtractor(file_path=SAMPLE_PDF, use_mmap=False) as extractor:
+        data = extractor.get_pdf_data()
+
+        assert extractor._mmap is None
+        assert isinstance(data, bytes)
+    with open(SAMPLE_PDF, "rb") as file:
+        assert data == file.read()
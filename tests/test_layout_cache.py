@@ -0,0 +1,32 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from layout_cache import LayoutCache
+from pdf_processor import PageLayout
+
+
+def make_layout(texts):
+    boxes = PageLayout.bbox_array([(10.0, 700.0 - 20 * row, 90.0, 715.0 - 20 * row) for row in range(len(texts))])
+    return PageLayout(0, boxes, texts, PageLayout.bbox_array([]), PageLayout.bbox_array([]))
+
+
+def test_texts_with_lone_surrogates_round_trip(tmp_path):
+    # pdfminer emits lone surrogates for some broken ToUnicode maps
+    texts = ["Date", "bad \ud800 glyph", "Amount ₹"]
+    cache = LayoutCache(str(tmp_path))
+
+    cache.put("key", PageLayout.pack([make_layout(texts)]))
+
+    assert PageLayout.unpack(cache.get("key"))[0].texts == texts
+
+
+def test_failed_write_is_a_miss(tmp_path):
+    cache = LayoutCache(str(tmp_path))
+
+    # Object arrays are pickled, and a lambda can't be
+    cache.put("key", {"boxes": [lambda: None]})
+
+    assert cache.get("key") is None
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".tmp-")]
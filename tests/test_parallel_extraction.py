@@ -0,0 +1,29 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_processor import PDFTableExtractor
+from template_index import TemplateIndex
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples", "test6.pdf")
+
+
+def extract_twice(page_workers):
+    # The second document of the template is sliced by the columns learned from the first
+    template_index = TemplateIndex()
+    results = [PDFTableExtractor(file_path=SAMPLE_PDF, template_index=template_index, stitch_tables=True,
+                                 infer_types=True, page_workers=page_workers).extract_tables()
+               for _ in range(2)]
+    return results, template_index.plans
+
+
+def test_page_workers_match_a_single_process():
+    sequential, sequential_plans = extract_twice(1)
+    parallel, parallel_plans = extract_twice(2)
+
+    assert parallel_plans == sequential_plans
+    for expected, tables in zip(sequential, parallel):
+        assert list(tables) == list(expected)
+        for name, df in tables.items():
+            assert df.equals(expected[name])
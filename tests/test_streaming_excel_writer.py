@@ -0,0 +1,25 @@
+import io
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_processor import save_tables_to_excel
+
+
+def test_long_table_names_sharing_a_prefix_get_unique_sheets():
+    prefix = "Bordered_Table_Page12_with_a_long_name"
+    tables = {
+        prefix + "_1": pd.DataFrame([["a", "1"]]),
+        prefix + "_2": pd.DataFrame([["b", "2"]]),
+        prefix.upper() + "_3": pd.DataFrame([["c", "3"]]),
+    }
+
+    output = io.BytesIO()
+    save_tables_to_excel(tables, output)
+
+    sheets = pd.read_excel(io.BytesIO(output.getvalue()), sheet_name=None)
+    assert list(sheets) == [prefix[:31], prefix[:29] + "_2", prefix.upper()[:29] + "_3"]
+    assert [sheet.iloc[0, 0] for sheet in sheets.values()] == ["a", "b", "c"]
@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from table_cache import TableCache
+
+
+def make_tables(rows):
+    return {"Table_1": pd.DataFrame({"amount": [str(row) for row in range(rows)]})}
+
+
+def test_disk_store_evicts_least_recently_used_entries(tmp_path):
+    cache = TableCache(max_bytes=0, cache_dir=str(tmp_path))
+    cache.put("a", make_tables(1000))
+    # Room for two entries of this size
+    cache.max_disk_bytes = int(2.5 * sum(entry.stat().st_size for entry in os.scandir(tmp_path / "a")))
+    time.sleep(0.01)
+    cache.put("b", make_tables(1000))
+    time.sleep(0.01)
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") is not None
+    time.sleep(0.01)
+    cache.put("c", make_tables(1000))
+
+    assert sorted(os.listdir(tmp_path)) == ["a", "c"]
+    assert cache.stats()["disk_evictions"] == 1
+
+
+def test_unreadable_entry_is_a_miss_and_removed(tmp_path):
+    cache = TableCache(max_bytes=0, cache_dir=str(tmp_path))
+    cache.put("key", make_tables(10))
+    entry_dir = tmp_path / "key"
+    for file_name in os.listdir(entry_dir):
+        (entry_dir / file_name).write_bytes(b"not a pickle")
+
+    assert cache.get("key") is None
+    assert not entry_dir.exists()
+
+
+def test_put_reports_whether_the_tables_were_kept(tmp_path):
+    assert TableCache().put("key", make_tables(10))
+    assert not TableCache(max_bytes=0).put("key", make_tables(10))
+    assert TableCache(max_bytes=0, cache_dir=str(tmp_path)).put("key", make_tables(10))
@@ -0,0 +1,43 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_store
+from pdf_processor import PDFTableExtractor
+from strategy_planner import StrategyPlanner
+from template_index import TemplateIndex
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples", "test6.pdf")
+
+
+def test_indexes_sharing_a_file_keep_each_others_plans(tmp_path):
+    path = str(tmp_path / "templates.json")
+    first = TemplateIndex(path)
+    second = TemplateIndex(path)
+
+    first.put("a", {"columns": [0, 100]})
+    second.put("b", {"columns": [0, 50]})
+
+    assert TemplateIndex(path).plans == {"a": {"columns": [0, 100]}, "b": {"columns": [0, 50]}}
+
+
+def test_planner_winners_persist(tmp_path):
+    path = str(tmp_path / "planner.json")
+    features = {"table_type": "bank_statement", "labels": ["account name"]}
+
+    StrategyPlanner(path).record(features, "layout")
+
+    assert StrategyPlanner(path).winners == {StrategyPlanner.template_key(features): "layout"}
+
+
+def test_a_document_is_learned_with_a_single_write(tmp_path, monkeypatch):
+    saves = []
+    save = json_store.JsonStore._save
+    monkeypatch.setattr(json_store.JsonStore, "_save", lambda store: saves.append(1) or save(store))
+    template_index = TemplateIndex(str(tmp_path / "templates.json"))
+
+    PDFTableExtractor(file_path=SAMPLE_PDF, template_index=template_index).extract_tables()
+
+    assert len(template_index.plans) == 1
+    assert len(saves) == 1
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_processor import TextBoxGridIndex
+
+
+def brute_force(boxes, rect):
+    return np.flatnonzero((boxes[:, 0] >= rect[0]) & (boxes[:, 1] >= rect[1]) &
+                          (boxes[:, 2] <= rect[2]) & (boxes[:, 3] <= rect[3]))
+
+
+def test_matches_a_scan_of_every_box():
+    rng = np.random.default_rng(0)
+    corners = rng.uniform(0, 600, (500, 2))
+    boxes = np.hstack([corners, corners + rng.uniform(5, 40, (500, 2))]).astype(np.float32)
+    index = TextBoxGridIndex(boxes)
+
+    rects = [(-1e5, -1e5, 1e5, 1e5), (-50, 100, 700, 120), (700, 700, 900, 900)]
+    for _ in range(200):
+        x0, y0 = rng.uniform(-200, 800, 2)
+        width, height = rng.uniform(0, 700, 2)
+        rects.append((x0, y0, x0 + width, y0 + height))
+
+    for rect in rects:
+        assert np.array_equal(index.contained_in(rect), brute_force(boxes, rect))
+
+
+def test_empty_page():
+    index = TextBoxGridIndex(np.zeros((0, 4), dtype=np.float32))
+
+    assert len(index.contained_in((-1e5, -1e5, 1e5, 1e5))) == 0